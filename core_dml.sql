@@ -145,6 +145,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS initial_asmt_summary_qtr_metrics_uidx
+    ON core.initial_asmt_summary (quarter_ending, metrics);
+
 ALTER TABLE IF EXISTS core.initial_asmt_summary
     OWNER TO postgres;
 
@@ -371,6 +375,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS prevention_duty_summary_qtr_metrics_uidx
+    ON core.prevention_duty_summary (quarter_ending, metrics);
+
 ALTER TABLE IF EXISTS core.prevention_duty_summary
     OWNER TO postgres;
 
@@ -597,6 +605,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS relief_duty_summary_qtr_metrics_uidx
+    ON core.relief_duty_summary (quarter_ending, metrics);
+
 ALTER TABLE IF EXISTS core.relief_duty_summary
     OWNER TO postgres;
 
@@ -787,6 +799,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS prevention_duty_ending_summary_qtr_metrics_uidx
+    ON core.prevention_duty_ending_summary (quarter_ending, metrics);
+
 ALTER TABLE IF EXISTS core.prevention_duty_ending_summary
     OWNER TO postgres;
 
@@ -986,6 +1002,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS relief_duty_ending_summary_qtr_metrics_uidx
+    ON core.relief_duty_ending_summary (quarter_ending, metrics);
+
 ALTER TABLE IF EXISTS core.relief_duty_ending_summary
     OWNER TO postgres;
 
@@ -1273,6 +1293,10 @@ AS
    FROM pivot_la
 WITH DATA;
 
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS temp_accommodation_summary_qtr_metrics_uidx
+    ON core.temp_accommodation_summary (quarter_ending, metrics);
+
 -- View: core.temp_accommodation_households_summary
 
 DROP MATERIALIZED VIEW IF EXISTS core.temp_accommodation_households_summary;
@@ -1450,6 +1474,10 @@ AS
     hackney_la - neighbouring_la AS difference
    FROM pivot_la
 WITH DATA;
+
+-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS temp_accommodation_households_summary_qtr_metrics_uidx
+    ON core.temp_accommodation_households_summary (quarter_ending, metrics);
 	
 SELECT *
 FROM core.temp_accommodation_households_summary;
\ No newline at end of file
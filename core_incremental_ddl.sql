@@ -0,0 +1,36 @@
+-- Incremental summaries: turn the core.*_summary materialized views into tables maintained per quarter_ending
+-- run once after core_dml.sql (and again whenever core_dml.sql is re-run), then run access_dql.sql again
+-- the query of each materialized view is kept as the plain view core.<name>_def
+-- the etl deletes and re-inserts only the quarters touched by a delta load from core.<name>_def
+
+DO $$
+DECLARE
+    summary_name text;
+    summary_query text;
+BEGIN
+    FOREACH summary_name IN ARRAY ARRAY['initial_asmt_summary',
+                                        'prevention_duty_summary',
+                                        'relief_duty_summary',
+                                        'prevention_duty_ending_summary',
+                                        'relief_duty_ending_summary',
+                                        'temp_accommodation_summary',
+                                        'temp_accommodation_households_summary']
+    LOOP
+        SELECT definition INTO summary_query
+          FROM pg_matviews
+         WHERE schemaname = 'core' AND matviewname = summary_name;
+
+        -- already converted (or not created yet)
+        CONTINUE WHEN summary_query IS NULL;
+
+        -- keep the transformation query as a plain view
+        EXECUTE format('CREATE OR REPLACE VIEW core.%I AS %s', summary_name || '_def', rtrim(summary_query, '; '));
+        EXECUTE format('ALTER TABLE core.%I OWNER TO postgres', summary_name || '_def');
+
+        -- replace the materialized view (and the public view on it) with a table of the same name
+        EXECUTE format('DROP MATERIALIZED VIEW core.%I CASCADE', summary_name);
+        EXECUTE format('CREATE TABLE core.%I AS SELECT * FROM core.%I', summary_name, summary_name || '_def');
+        EXECUTE format('CREATE INDEX %I ON core.%I (quarter_ending)', summary_name || '_qtr_idx', summary_name);
+        EXECUTE format('ALTER TABLE core.%I OWNER TO postgres', summary_name);
+    END LOOP;
+END $$;
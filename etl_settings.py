@@ -0,0 +1,28 @@
+etl_var = {
+    'root_dir': "/Users/osagieaib/Library/CloudStorage/OneDrive-GodsVisionEnterprise/Documents/Interview/Hackney Council",
+    'read_fdr': "SourceData",
+    'write_fdr': "TransformedData",
+    'sheet_cache_fdr': ".sheet_cache",
+    'sheet_cache_max_mb': 512,
+    'use_sheet_cache': True,
+    'clean_workers': None,
+    'max_parallel_tasks': 4,
+    'hash_delta_id': True,
+    'delta_mode': 'python',
+    'load_method': 'copy',
+    'sync_obsolete_rows': False,
+    'staging_key_cols': ['system_id', 'quarter_ending'],
+    'partition_swap_load': False,
+    'persist_table_metadata': False,
+    'table_metadata_file': ".table_metadata.pkl",
+    'read_chunk_rows': 50000,
+    'summary_refresh_mode': 'full',
+    'concurrent_mview_refresh': True,
+    'log_level': 'INFO',
+    'categorical_local_authority': False,
+    # comparison groups of local authorities: {flag column: member local authorities}, each flagged 1/0 (int8)
+    'la_groups': {'is_neighbouring_la': ['Southwark', 'Islington', 'Haringey', 'Lambeth', 'Tower Hamlets', 'Camden',
+                                         'Waltham Forest', 'Hammersmith & Fulham', 'Newham']},
+    # flags of la_groups with a column in the staging tables (staging_ddl.sql); the others are not loaded
+    'staged_la_groups': ['is_neighbouring_la']
+}
@@ -1,21 +1,236 @@
 import sqlalchemy as db
 from sqlalchemy import text
 import pandas as pd
-import copy
+import numpy as np
 import re
 import os
+import json
+import pickle
+import hashlib
+import time
+import io
+import numbers
+import csv
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSummary:
+    """df.info() (or another summary method of a dataframe or series) rendered only when a log record using it
+    is actually emitted, so disabled DEBUG messages cost nothing"""
+
+    def __init__(self, df: 'pandas dataframe', method: str = 'info'):
+        self.df = df
+        self.method = method
+
+    def __str__(self):
+        if self.method == 'info':
+            info_buf = io.StringIO()
+            self.df.info(buf=info_buf)
+            return info_buf.getvalue()
+        return str(getattr(self.df, self.method)())
 
 
 class ProjUtil:
 
+    # sheets to parse together whenever a workbook is first opened (None disables the workbook cache)
+    workbook_sheets = None
+    # parsed sheets per workbook: {(file path, skiprows): {sheet name: dataframe}}
+    workbook_cache = dict()
+    # workbooks that failed to parse while priming: {(file path, skiprows): error}
+    workbook_failures = dict()
+    # cleaning spec per DLUHC sheet, keyed by the use_func name of the sheet
+    # col_mapper: source column name -> staging column name, listed in staging column order
+    # flt_cols: metric columns holding decimals, every other metric column holds integers
+    # '{prefix}' in a column name is replaced by the duty type (prevention or relief) when the spec is compiled
+    sheet_specs = {
+        'a1': {'col_mapper': {"Unnamed: 0": "system_id",
+                              "Unnamed: 1": "local_authority",
+                              "Total number of households assessed1,2": "initial_assessments",
+                              "Total households assessed as owed a duty": "owed_prevention_or_relief_duty",
+                              "Threatened with homelessness - Prevention duty owed": "prevention_duty_owed",
+                              "Homeless - Relief duty owed": "relief_duty_owed",
+                              "Unnamed: 15": "households_in_area_000s"},
+               'flt_cols': ['households_in_area_000s']},
+        'a2': {'col_mapper': {"Unnamed: 0": "system_id",
+                              "Unnamed: 1": "local_authority",
+                              "Unnamed: 4": "{prefix}_duty_owed",
+                              "Family or friends no longer willing or able to accommodate": "family_or_friend_terminations",
+                              "End of private rented tenancy - assured shorthold": "ast_private_rented_terminations",
+                              "Domestic abuse": "domestic_abuse_terminations",
+                              "Non-violent relationship breakdown with partner": "non_violent_relationship_breakdown_terminations",
+                              "End of social rented tenancy": "social_rented_tenancy_terminations",
+                              "Eviction from supported housing": "supported_housing_terminations",
+                              "End of private rented tenancy - not assured shorthold": "non_ast_private_rented_terminations",
+                              "Other violence or harrassment": "other_violence_or_harassment_terminations",
+                              "Left institution with no accommodation available": "institution_departures",
+                              "Required to leave accommodation provided by Home Office as asylum support": "home_office_asylum_support_terminations",
+                              "Home no longer suitable - disability / ill health": "new_home_for_illness_or_disability",
+                              "Unnamed: 56": "loss_of_placement_or_sponsorship",
+                              "Other reasons / not known6": "for_other_or_unknown_reasons"},
+               'flt_cols': []},
+        'p1': {'col_mapper': {"Unnamed: 0": "system_id",
+                              "Unnamed: 1": "local_authority",
+                              "Total number of households where {prefix} duty ended1,2": "{prefix}_duty_ended",
+                              "Secured accommodation for 6+ months": "secured_accommodation",
+                              "Homeless (including intentionally homeless)": "homelessness",
+                              "Contact lost": "contact_lost",
+                              "56 days elapsed and no further action": "no_further_action_after_56days",
+                              "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
+                              "No longer eligible": "no_longer_eligible",
+                              "Refused suitable accommodation offer": "rejected_offered_accommodation",
+                              "Refused to cooperate": "uncooperative",
+                              "Not known6": "not_known"},
+               'flt_cols': []},
+        'r1': {'col_mapper': {"Unnamed: 0": "system_id",
+                              "Unnamed: 1": "local_authority",
+                              "Total number of households where {prefix} duty ended1,2": "{prefix}_duty_ended",
+                              "Secured accommodation for 6+ months": "secured_accommodation",
+                              "56 days elapsed": "after_56days_deadline",
+                              "Contact lost": "contact_lost",
+                              "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
+                              "Refused final accommodation": "rejected_final_accommodation_offered",
+                              "Intentionally homeless from accommodation provided": "intentionally_homeless_from_accommodation_provided",
+                              "Local connection referral accepted by other LA": "accepted_by_another_la",
+                              "No longer eligible": "no_longer_eligible",
+                              "Notice served due to refusal to cooperate": "uncooperative_and_served_notice",
+                              "Not known": "not_known"},
+               'flt_cols': []},
+        'ta1': {'col_mapper': {"Unnamed: 0": "system_id",
+                               "Unnamed: 1": "local_authority",
+                               "Households in temporary accommodation at end of quarter1": "households_in_ta",
+                               "Households in temporary accommodation at end of quarter1 children": "ta_households_with_children",
+                               "Unnamed: 8": "children_headcount_in_ta",
+                               "Bed and breakfast hotels (including shared annexes)": "bnb_ta_households",
+                               "Bed and breakfast hotels (including shared annexes) children": "bnb_ta_with_children",
+                               "Unnamed: 12": "bnb_ta_with_children_exceeding_6wks",
+                               "Unnamed: 13": "bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal",
+                               "Unnamed: 14": "bnb_ta_with_16yo_17yo_main_applicant",
+                               "Nightly paid, privately managed accommodation, self-contained": "nightly_paid_ta_households",
+                               "Nightly paid, privately managed accommodation, self-contained children": "nightly_paid_ta_with_children",
+                               "Hostels (including reception centres, emergency units and refuges)": "hostel_ta_households",
+                               "Hostels (including reception centres, emergency units and refuges) children": "hostel_ta_with_children",
+                               "Private sector accommodation leased by authority or by a registered provider": "private_sector_ta",
+                               "Private sector accommodation leased by authority or by a registered provider children": "private_sector_ta_with_children",
+                               "Local authority or Housing association (LA/HA) stock": "la_ha_owned_managed_ta_households",
+                               "Local authority or Housing association (LA/HA) stock children": "la_ha_owned_managed_ta_with_children",
+                               "Any other type of temporary accommodation (including private landlord and not known)2": "any_other_type_ta",
+                               "Any other type of temporary accommodation (including private landlord and not known)2 children": "any_other_type_ta_with_children",
+                               "In TA in another local authority district": "in_another_la_ta",
+                               "Duty owed, no accommodation secured3": "no_secured_accommodation_ta",
+                               "Duty owed, no accommodation secured3 children": "no_secured_accommodation_ta_with_children"},
+                'flt_cols': []},
+        'ta2': {'col_mapper': {"Unnamed: 0": "system_id",
+                               "Unnamed: 1": "local_authority",
+                               "Unnamed: 4": "households_in_ta",
+                               "Couple with dependent children": "couple_with_children_ta",
+                               "Single parent with dependent children  -  Male": "single_father_with_children_ta",
+                               "Single parent with dependent children  -  Female": "single_mother_with_children_ta",
+                               "Single parent with dependent children  -  Other/gender not known": "single_parent_of_other_unknown_gender_with_children_ta",
+                               "Single adult  -  Male": "single_man_ta",
+                               "Single adult  -  Female": "single_woman_ta",
+                               "Single adult  -  Other/gender not known": "single_other_gender_ta",
+                               "All other household types4": "all_other_household_types_ta"},
+                'flt_cols': []}}
+    # compiled specs with their column lists: {(use_func, prefix): dict}
+    compiled_sheet_specs = dict()
+    # DLUHC markers for suppressed, unavailable or not applicable figures, read as missing values
+    missing_value_markers = ['..', 'x', '-', '[c]']
+    # on-disk cache of parsed sheets (None disables the sheet cache)
+    sheet_cache_dir = None
+    sheet_cache_max_bytes = 512 * 1024 ** 2
+    # content hash of each source file: {file path: {'mtime': float, 'size': int, 'sha256': str}}
+    sheet_cache_hashes = dict()
+    # files whose hash entry changed since the last collect_sheet_cache_hashes call
+    sheet_cache_changed = set()
+    # worker processes hand their new hashes to the parent instead of writing file_hashes.json themselves
+    sheet_cache_defer_save = False
+    sheet_cache_lock = threading.Lock()
+    # shared sqlalchemy engines per database url, borrowed by every pipeline
+    engine_registry = dict()
+    engine_registry_lock = threading.Lock()
+    # libpq environment variables that override the matching pg_var entries
+    pg_env_overrides = {'PGUSER': 'db_user', 'PGPASSWORD': 'db_pwd', 'PGHOST': 'db_host', 'PGPORT': 'db_port',
+                        'PGDATABASE': 'db_name'}
+    # pg_var entries passed on to the engine's QueuePool
+    pool_setting_keys = ['pool_size', 'max_overflow', 'pool_pre_ping', 'pool_recycle']
+    # reflected tables: {(engine url, 'schema.table'): metadata holding the table}
+    table_metadata_cache = dict()
+    table_metadata_lock = threading.Lock()
+    # pickle file the reflected tables persist to between runs (None keeps them in memory only)
+    table_metadata_file = None
+    # generated column of the keyed staging tables holding the md5 of the row (see staging_ddl.sql)
+    stored_fingerprint_col = 'row_fingerprint'
+
+    @staticmethod
+    def configure_logging(level: 'level name or number' = 'INFO'):
+        """send the log records of every module to stderr from the given level up
+        DEBUG adds dataframe summaries and per-file progress, INFO keeps the per-stage milestones"""
+
+        logging.basicConfig(level=level, format='%(asctime)s %(levelname)s %(name)s: %(message)s', force=True)
+
     @staticmethod
     def refresh_pgsql_mview(db_conn: 'database connection',
                             refresh_schema: str,
-                            refresh_mview_name: str):
-        """refresh materialized view"""
+                            refresh_mview_name: str,
+                            concurrently=False):
+        """refresh materialized view
+        concurrently: refresh without locking out readers; falls back to a plain refresh when the view
+        has no data yet or no unique index, which REFRESH ... CONCURRENTLY requires"""
+
+        if concurrently:
+            mview_state = ProjUtil.get_mview_state(db_conn, refresh_schema, refresh_mview_name)
+            if not mview_state['ispopulated']:
+                logger.info("Materialized view has no data yet, refreshing without CONCURRENTLY.")
+                concurrently = False
+            elif not mview_state['has_unique_index']:
+                logger.info("Materialized view has no unique index, refreshing without CONCURRENTLY.")
+                concurrently = False
+
+        refresh_mode = 'CONCURRENTLY ' if concurrently else ''
+        db_conn.execute(text(f"REFRESH MATERIALIZED VIEW {refresh_mode}{refresh_schema}.{refresh_mview_name};"))
+        db_conn.commit()
+        logger.info("Materialized view %s.%s refreshed successfully.", refresh_schema, refresh_mview_name)
 
-        db_conn.execute(text(f"REFRESH MATERIALIZED VIEW {refresh_schema}.{refresh_mview_name};"))
-        print("Materialized view refreshed successfully.")
+    @staticmethod
+    def get_mview_state(db_conn: 'database connection', mview_schema: str, mview_name: str) -> dict:
+        """whether a materialized view holds data and has a unique index without predicate
+        output: dict(ispopulated, has_unique_index)"""
+
+        mview_state = db_conn.execute(text(
+            "SELECT m.ispopulated, "
+            "EXISTS (SELECT 1 FROM pg_index i "
+            "WHERE i.indrelid = format('%I.%I', m.schemaname, m.matviewname)::regclass "
+            "AND i.indisunique AND i.indpred IS NULL) AS has_unique_index "
+            "FROM pg_matviews m WHERE m.schemaname = :mview_schema AND m.matviewname = :mview_name"),
+            {'mview_schema': mview_schema, 'mview_name': mview_name}).mappings().first()
+        if mview_state is None:
+            raise ValueError(f'{mview_schema}.{mview_name} is not a materialized view')
+        return dict(mview_state)
+
+    @staticmethod
+    def refresh_summary_quarters(db_conn: 'database connection', refresh_schema: str, refresh_summary_name: str,
+                                 quarters: 'list of quarter_ending values', qtr_col: str = 'quarter_ending'):
+        """recompute only the given quarters of a summary table created by core_incremental_ddl.sql
+        rows of those quarters are deleted and re-inserted from the <name>_def view in one transaction
+        output: number of summary rows inserted"""
+
+        if not quarters:
+            logger.info("No quarter changed, summary table left as is.")
+            return 0
+
+        summary_table = f'{refresh_schema}.{refresh_summary_name}'
+        qtr_filter = f"WHERE {qtr_col} IN :quarters"
+        qtr_param = db.bindparam('quarters', value=list(quarters), expanding=True)
+        db_conn.execute(text(f"DELETE FROM {summary_table} {qtr_filter}").bindparams(qtr_param))
+        n_rows = db_conn.execute(text(f"INSERT INTO {summary_table} SELECT * FROM {summary_table}_def {qtr_filter}")
+                                 .bindparams(qtr_param)).rowcount
+        db_conn.commit()
+        logger.info("Summary table refreshed for %d quarter(s): %d rows.", len(quarters), n_rows)
+        return n_rows
 
     @staticmethod
     def get_qtr_from_fname(filename: str, delim_char="_"):
@@ -69,77 +284,275 @@ class ProjUtil:
                 date_dtype = df[date_cols[i]].astype('datetime64[ns]')
                 df[date_cols[i]] = date_dtype
                 if show_progress:
-                    print(f"{date_cols[i]}'s DATATYPE CHANGED!")
+                    logger.debug("%s's DATATYPE CHANGED!", date_cols[i])
             if show_progress:
-                print('date columns assigned')
+                logger.debug('date columns assigned')
 
-        if len(flt_cols):
-            for i in range(len(flt_cols)):
-                flt_dtype = pd.to_numeric(df[flt_cols[i]], errors='coerce').astype('float64')
-                df[flt_cols[i]] = flt_dtype
-                if show_progress:
-                    print(f"{flt_cols[i]}'s DATATYPE CHANGED!")
-            if show_progress:
-                print('decimal columns assigned')
-
-        if len(int_cols):
-            for i in range(len(int_cols)):
-                int_dtype = pd.to_numeric(df[int_cols[i]], errors='coerce')  # Converts invalid entries to NaN
-                int_dtype = int_dtype.astype('Int64')
-                df[int_cols[i]] = int_dtype
-                if show_progress:
-                    print(f"{int_cols[i]}'s DATATYPE CHANGED!")
+        if len(flt_cols) or len(int_cols):
+            # invalid entries become NaN
+            df = ProjUtil.coerce_numeric_block(df, int_cols=int_cols, flt_cols=flt_cols, na_markers=list())
             if show_progress:
-                print('integer columns assigned')
+                logger.debug('%d decimal and %d integer columns assigned', len(flt_cols), len(int_cols))
 
         if len(str_cols):
             for i in range(len(str_cols)):
                 str_dtype = df[str_cols[i]].astype('str')
                 df[str_cols[i]] = str_dtype
                 if show_progress:
-                    print(f"{str_cols[i]}'s DATATYPE CHANGED!")
+                    logger.debug("%s's DATATYPE CHANGED!", str_cols[i])
             if show_progress:
-                print('string columns assigned')
+                logger.debug('string columns assigned')
 
-        print(df.info())
+        logger.debug('%s', FrameSummary(df))
         if show_progress:
-            print('\nCOLUMN DATA TYPE RECAST COMPLETE\n')
+            logger.debug('COLUMN DATA TYPE RECAST COMPLETE')
 
         return df
 
+    @staticmethod
+    def coerce_numeric_block(df: 'pandas dataframe', int_cols: 'list of integer column names' = list(),
+                             flt_cols: 'list of decimal column names' = list(), na_markers: list = None,
+                             return_counts=False):
+        """turn a block of metric columns into nullable numeric columns in one pass
+        cells of the raw object array exactly equal to a marker in na_markers (default missing_value_markers)
+        become NA, without regex or a round trip through python str, so a value can never be partly rewritten;
+        the block is then parsed by a single to_numeric
+        any other cell that is not a number, booleans included, is coerced to NA too: those are counted per
+        column and reported, as they point at a marker or format the cleaning does not know about
+        int_cols become Int64, flt_cols float64
+        output: pandas dataframe, plus the per-column counts of coerced cells if return_counts"""
+
+        num_cols = list(int_cols) + list(flt_cols)
+        if not num_cols:
+            return (df, pd.Series(dtype='int64')) if return_counts else df
+        na_markers = ProjUtil.missing_value_markers if na_markers is None else na_markers
+
+        block_vals = df[num_cols].to_numpy(dtype=object)
+        flat_vals = block_vals.ravel()
+        # hash lookup on the raw cells: only whole-cell matches are markers
+        is_marker = pd.Series(flat_vals).isin(na_markers).to_numpy() if len(na_markers) else np.zeros(
+            flat_vals.shape, dtype=bool)
+        is_missing = pd.isna(flat_vals) | is_marker
+        # to_numeric would read True as 1, where the str round trip of the legacy cleaning gave NA
+        is_bool = np.fromiter((isinstance(val, (bool, np.bool_)) for val in flat_vals), dtype=bool,
+                              count=len(flat_vals))
+        num_vals = pd.to_numeric(np.where(is_marker | is_bool, None, flat_vals), errors='coerce')
+
+        coerced_cells = pd.Series((np.isnan(num_vals) & ~is_missing).reshape(block_vals.shape).sum(axis=0),
+                                  index=num_cols)
+        if coerced_cells.any():
+            logger.warning('%d non-numeric cells coerced to NA: %s', coerced_cells.sum(),
+                           coerced_cells[coerced_cells > 0].to_dict())
+
+        df[num_cols] = pd.DataFrame(num_vals.reshape(block_vals.shape), index=df.index, columns=num_cols).astype(
+            {**dict.fromkeys(int_cols, 'Int64'), **dict.fromkeys(flt_cols, 'float64')})
+        return (df, coerced_cells) if return_counts else df
+
     @staticmethod
     def append_to_sample_df(sample_df: "pandas dataframe",
                             file_path_dict: dict,
                             assign_colname: str,
                             sheet_name: str = None,
                             prefix: str="prevention",
-                            use_func: str="a1") -> 'pandas dataframe':
+                            use_func: str="a1",
+                            workers: int = None,
+                            la_groups: dict = None,
+                            categorical_la=False) -> 'pandas dataframe':
         """append data extracted from all remaining files in the source folder
         to data extracted from model file (aka sample file)
+        use_func: key of the sheet's cleaning spec in sheet_specs
+        workers: number of processes cleaning files in parallel (None or 1 cleans them one at a time)
+        a file that fails to clean is reported and left out of the output
+        la_groups: local authority groups flagged by clean_tab
+        categorical_la: if true, local_authority is carried as one categorical column over all the quarters
         returns dataframe containing the complete dataset from files in source folder"""
 
-        df_list = [sample_df]
-        # for excel files
+        # arguments of clean_tab for each file, in file_path_dict order
+        clean_jobs = list()
         for f, fpath in file_path_dict.items():
             file_name, file_ext = f.split('.')
-            # print(file_comp)
-            print(f'\nReading {file_name}')
             qtr_val = ProjUtil.get_qtr_from_fname(file_name)
-            if use_func not in ["a1", "ta1", "ta2"]:
-                funct_call = f"ProjUtil.clean_tab_{use_func}(abs_file_path=fpath, sheet_name=sheet_name, assign_col=assign_colname, assign_val=qtr_val, prefix=prefix)"
-            else:
-                funct_call = f"ProjUtil.clean_tab_{use_func}(abs_file_path=fpath, sheet_name=sheet_name, assign_col=assign_colname, assign_val=qtr_val)"
-            df = eval(funct_call)
-            # print(df.info())
-            df_list.append(df)
-            # print(f'Appending {f}')
-            # append each qtr df into one df
-            # cache_df = sample_df._append(other=df)
+            clean_kwargs = dict(abs_file_path=fpath, use_func=use_func, sheet_name=sheet_name,
+                                assign_col=assign_colname, assign_val=qtr_val, prefix=prefix,
+                                la_groups=la_groups, categorical_la=categorical_la)
+            clean_jobs.append((f, clean_kwargs))
+
+        df_list = [sample_df]
+        failed_files = list()
+        if workers is None or workers <= 1:
+            # for excel files
+            for f, clean_kwargs in clean_jobs:
+                logger.debug('Reading %s', f)
+                try:
+                    df_list.append(ProjUtil.clean_tab(**clean_kwargs))
+                except Exception as err:
+                    failed_files.append(f)
+                    logger.error('FAILED TO CLEAN %s: %r', f, err)
+        else:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=ProjUtil.init_clean_worker,
+                                     initargs=(ProjUtil.sheet_cache_dir,
+                                               ProjUtil.sheet_cache_max_bytes,
+                                               ProjUtil.workbook_sheets,
+                                               logging.getLogger().getEffectiveLevel())) as pool:
+                futures = [(f, pool.submit(ProjUtil.run_cache_worker_task, ProjUtil.clean_tab, **clean_kwargs))
+                           for f, clean_kwargs in clean_jobs]
+                # collect results in submission order so the output does not depend on scheduling
+                for f, future in futures:
+                    try:
+                        df, new_hashes = future.result()
+                        df_list.append(df)
+                        ProjUtil.merge_sheet_cache_hashes(new_hashes)
+                        logger.debug('Cleaned %s', f)
+                    except Exception as err:
+                        failed_files.append(f)
+                        logger.error('FAILED TO CLEAN %s: %r', f, err)
+        if len(failed_files):
+            logger.warning('%d file(s) left out of %s: %s', len(failed_files), sheet_name, failed_files)
 
         cache_df = pd.concat(df_list)
+        if categorical_la:
+            # quarters with different sets of local authorities concatenate to object, recast over the union
+            cache_df['local_authority'] = cache_df['local_authority'].astype('category')
 
         return cache_df
 
+    @staticmethod
+    def prime_workbook_cache(file_paths: 'list of file paths', skiprows: int = 0, workers: int = None):
+        """parse the given workbooks into the workbook cache ahead of cleaning
+        workers: number of processes parsing workbooks in parallel (None or 1 parses them one at a time)
+        a workbook that fails to parse is logged, kept out of the cache and remembered in workbook_failures,
+        so cleaning reports its quarter as failed without parsing it again, and the other workbooks carry on"""
+
+        if ProjUtil.workbook_sheets is None:
+            raise ValueError('enable_workbook_cache must be called before prime_workbook_cache')
+
+        file_paths = [fpath for fpath in file_paths if (fpath, skiprows) not in ProjUtil.workbook_cache]
+        failed_files = list()
+        if workers is None or workers <= 1:
+            for fpath in file_paths:
+                try:
+                    ProjUtil.workbook_cache[(fpath, skiprows)] = ProjUtil.pull_workbook_xl(
+                        file_path=fpath, sheet_names=ProjUtil.workbook_sheets, skiprows=skiprows)
+                except Exception as err:
+                    ProjUtil.workbook_failures[(fpath, skiprows)] = err
+                    failed_files.append(fpath)
+                    logger.error('FAILED TO PARSE %s: %r', fpath, err)
+        else:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=ProjUtil.init_clean_worker,
+                                     initargs=(ProjUtil.sheet_cache_dir, ProjUtil.sheet_cache_max_bytes, None,
+                                               logging.getLogger().getEffectiveLevel())) as pool:
+                futures = [(fpath, pool.submit(ProjUtil.run_cache_worker_task, ProjUtil.pull_workbook_xl, fpath,
+                                               ProjUtil.workbook_sheets, skiprows))
+                           for fpath in file_paths]
+                for fpath, future in futures:
+                    try:
+                        xl_sheets, new_hashes = future.result()
+                    except Exception as err:
+                        ProjUtil.workbook_failures[(fpath, skiprows)] = err
+                        failed_files.append(fpath)
+                        logger.error('FAILED TO PARSE %s: %r', fpath, err)
+                        continue
+                    ProjUtil.workbook_cache[(fpath, skiprows)] = xl_sheets
+                    ProjUtil.merge_sheet_cache_hashes(new_hashes)
+        if len(failed_files):
+            logger.warning('%d workbook(s) could not be parsed: %s', len(failed_files), failed_files)
+        logger.info('%d WORKBOOKS PARSED', len(file_paths) - len(failed_files))
+
+    @staticmethod
+    def run_task_graph(tasks: dict, max_workers: int = 4) -> dict:
+        """run tasks concurrently, starting each one as soon as all the tasks it depends on have finished
+        tasks: {task name: (callable taking no arguments, list of task names it depends on)}
+        tasks depending on a failed task are skipped, and a RuntimeError naming the failed tasks is raised at the end
+        output: dict(task name: seconds taken)"""
+
+        for name, (task_func, depends_on) in tasks.items():
+            unknown = [dep for dep in depends_on if dep not in tasks]
+            if len(unknown):
+                raise ValueError(f'{name} depends on unknown task(s) {unknown}')
+
+        graph_start = time.perf_counter()
+        task_times = dict()
+        failed, skipped, done = dict(), list(), set()
+        pending = dict(tasks)
+        running = dict()
+        start_times = dict()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while len(pending) or len(running):
+                # skip tasks whose dependencies failed, submit those whose dependencies are done
+                for name, (task_func, depends_on) in list(pending.items()):
+                    if any(dep in failed or dep in skipped for dep in depends_on):
+                        skipped.append(name)
+                        pending.pop(name)
+                    elif all(dep in done for dep in depends_on):
+                        start_times[name] = time.perf_counter()
+                        running[pool.submit(task_func)] = name
+                        pending.pop(name)
+                if not len(running):
+                    if len(pending):
+                        raise ValueError(f'dependency cycle between tasks {list(pending)}')
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    task_times[name] = time.perf_counter() - start_times[name]
+                    try:
+                        future.result()
+                        done.add(name)
+                    except Exception as err:
+                        failed[name] = err
+                        logger.error('TASK %s FAILED: %r', name, err)
+
+        ProjUtil.report_task_times(task_times, wall_time=time.perf_counter() - graph_start)
+        if len(failed):
+            raise RuntimeError(f'failed tasks: {list(failed)}, skipped tasks: {skipped}')
+
+        return task_times
+
+    @staticmethod
+    def report_task_times(task_times: dict, wall_time: float = None, stage_sep=':'):
+        """log seconds taken per task and per stage
+        tasks are grouped into stages by the part of their name before stage_sep"""
+
+        stage_times = dict()
+        for name, seconds in task_times.items():
+            stage_times.setdefault(name.split(stage_sep)[0], list()).append(seconds)
+
+        logger.info('STAGE TIMINGS (seconds)')
+        logger.info(f"{'stage':<12}{'tasks':>6}{'total':>10}{'slowest':>10}")
+        for stage, times in stage_times.items():
+            logger.info(f'{stage:<12}{len(times):>6}{sum(times):>10.1f}{max(times):>10.1f}')
+        logger.info('TASK TIMINGS (seconds)')
+        for name, seconds in sorted(task_times.items(), key=lambda item: -item[1]):
+            logger.info(f'{name:<24}{seconds:>10.1f}')
+        if wall_time is not None:
+            logger.info('WALL TIME: %.1f seconds', wall_time)
+
+    @staticmethod
+    def init_clean_worker(sheet_cache_dir: str, sheet_cache_max_bytes: int, workbook_sheets: list,
+                          log_level: int = None):
+        """carry the parent's sheet cache and logging settings into a worker process"""
+
+        if log_level is not None:
+            ProjUtil.configure_logging(log_level)
+
+        if sheet_cache_dir is not None:
+            ProjUtil.configure_sheet_cache(cache_dir=sheet_cache_dir, max_mb=sheet_cache_max_bytes / 1024 ** 2)
+            ProjUtil.sheet_cache_defer_save = True
+        if workbook_sheets is not None and ProjUtil.workbook_sheets is None:
+            ProjUtil.enable_workbook_cache(sheet_names=workbook_sheets)
+
+    @staticmethod
+    def run_cache_worker_task(task_func: 'callable', *args, **kwargs) -> tuple:
+        """run a task in a worker process and collect the sheet cache hashes it computed on the way
+        output: (task result, {file path: hash entry}) - pass the entries to merge_sheet_cache_hashes"""
+
+        ProjUtil.sheet_cache_changed.clear()
+        task_result = task_func(*args, **kwargs)
+        return task_result, ProjUtil.collect_sheet_cache_hashes()
+
     @staticmethod
     def switch_col_values(ser: 'pandas series', mapper: 'dictionary object'):
         """switch an old value with a new one as mapped in the given dictionary
@@ -150,43 +563,212 @@ class ProjUtil:
 
     @staticmethod
     def sqlalchem_select_query(table_name: str, schema_name: str, dbase_engine: "sqlalchemy engine instance",
-                               dbase_conn: "database connection instance"):
+                               dbase_conn: "database connection instance", chunk_rows: int = None,
+                               dtype_backend: str = None, columns: 'list of columns' = None, isin: dict = None,
+                               between: dict = None):
         """retrieve data from database table
+        chunk_rows: if given, stream the rows through a server-side cursor and build the frame chunk by chunk
+        dtype_backend: if given (e.g. 'pyarrow'), read with pd.read_sql into arrow-backed columns
+        columns, isin, between: projection and filters compiled into the sql, see build_select_query
          output: dataframe object"""
 
-        # create metadata object
-        db_metadata = db.MetaData()
-
+        # reflect the table once per engine, later reads reuse the cached table object
         # db_table = db.Table('support_plan_log', db_metadata, schema='supported housing', autoload_with=db_engine)
-        db_table = db.Table(table_name, db_metadata, schema=schema_name, autoload_with=dbase_engine)
-        print('TABLE OBJECT CREATED')
+        db_table = ProjUtil.get_reflected_table(table_name=table_name, schema_name=schema_name,
+                                                dbase_engine=dbase_engine)
+
+        # create select query object for table, only for the requested columns and rows
+        query = ProjUtil.build_select_query(db_table, columns=columns, isin=isin, between=between)
 
         # collect table header
-        header = db_table.columns.keys()
+        header = list(query.selected_columns.keys())
+
+        if dtype_backend:
+            df = pd.read_sql(query, dbase_conn, dtype_backend=dtype_backend)
+            logger.debug('QUERY OUTPUT IS AVAILABLE')
+            return df
+
+        if chunk_rows:
+            chunks = list(ProjUtil.stream_select_query(table_name=table_name, schema_name=schema_name,
+                                                       dbase_engine=dbase_engine, dbase_conn=dbase_conn,
+                                                       chunk_rows=chunk_rows, columns=columns, isin=isin,
+                                                       between=between))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=header)
+            logger.debug('QUERY OUTPUT IS AVAILABLE')
+            return df
 
-        # create select query object for table
-        query = db.select(db_table)
         # execute query
         output = dbase_conn.execute(query)
         # store query result
         data = output.fetchall()
         # parse query result as dataframe
         df = pd.DataFrame(data=data, columns=header)
-        print('\nQUERY OUTPUT IS AVAILABLE')
+        logger.debug('QUERY OUTPUT IS AVAILABLE')
 
         return df
 
+    @staticmethod
+    def stream_select_query(table_name: str, schema_name: str, dbase_engine: "sqlalchemy engine instance",
+                            dbase_conn: "database connection instance", chunk_rows: int = 50000,
+                            columns: 'list of columns' = None, isin: dict = None, between: dict = None):
+        """retrieve data from database table through a server-side cursor, chunk_rows rows at a time
+        integer, float and boolean columns get fixed dtypes so every chunk has the same dtypes
+        columns, isin, between: projection and filters compiled into the sql, see build_select_query
+        output: generator of dataframe objects"""
+
+        db_table = ProjUtil.get_reflected_table(table_name=table_name, schema_name=schema_name,
+                                                dbase_engine=dbase_engine)
+        query = ProjUtil.build_select_query(db_table, columns=columns, isin=isin, between=between)
+        header = list(query.selected_columns.keys())
+        col_dtypes = {col: dtype for col, dtype in ProjUtil.get_nullable_dtypes(db_table).items() if col in header}
+
+        # options set on the statement, as Connection.execution_options would change them for the caller's connection
+        output = dbase_conn.execute(query.execution_options(stream_results=True, yield_per=chunk_rows))
+        for rows in output.partitions():
+            yield pd.DataFrame.from_records(rows, columns=header).astype(col_dtypes)
+
+    @staticmethod
+    def build_select_query(db_table: 'sqlalchemy Table', columns: 'list of columns' = None, isin: dict = None,
+                           between: dict = None):
+        """select statement over db_table with the projection and filters in the sql itself
+        columns: columns to select, all columns if None
+        isin: {column: values} keeps rows whose column value is one of values
+        between: {column: (low, high)} keeps rows with low <= column value <= high, None leaves a side open
+        output: sqlalchemy select"""
+
+        query = db.select(*[db_table.c[col] for col in columns]) if columns else db.select(db_table)
+        for col, values in (isin or dict()).items():
+            query = query.where(db_table.c[col].in_(list(values)))
+        for col, (low, high) in (between or dict()).items():
+            if low is not None:
+                query = query.where(db_table.c[col] >= low)
+            if high is not None:
+                query = query.where(db_table.c[col] <= high)
+        return query
+
+    @staticmethod
+    def get_nullable_dtypes(db_table: 'sqlalchemy Table') -> dict:
+        """pandas dtypes holding nulls for the integer, float and boolean columns of a table
+        output: {column name: dtype}"""
+
+        nullable_dtypes = {int: 'Int64', float: 'float64', bool: 'boolean'}
+        col_dtypes = dict()
+        for col in db_table.columns:
+            try:
+                py_type = col.type.python_type
+            except NotImplementedError:
+                continue
+            if py_type in nullable_dtypes:
+                col_dtypes[col.name] = nullable_dtypes[py_type]
+        return col_dtypes
+
+    @staticmethod
+    def export_select_query_csv(table_name: str, schema_name: str, dbase_engine: "sqlalchemy engine instance",
+                                dbase_conn: "database connection instance", file_path: str,
+                                chunk_rows: int = 50000) -> int:
+        """write a database table or view to a csv file one streamed chunk at a time
+        only one chunk is held in memory
+        output: number of rows written"""
+
+        n_rows = 0
+        with open(file_path, 'w', encoding='utf8', newline='') as fh:
+            for chunk in ProjUtil.stream_select_query(table_name=table_name, schema_name=schema_name,
+                                                      dbase_engine=dbase_engine, dbase_conn=dbase_conn,
+                                                      chunk_rows=chunk_rows):
+                chunk.to_csv(fh, index=False, header=(n_rows == 0))
+                n_rows += len(chunk)
+            if not n_rows:
+                db_table = ProjUtil.get_reflected_table(table_name=table_name, schema_name=schema_name,
+                                                        dbase_engine=dbase_engine)
+                pd.DataFrame(columns=db_table.columns.keys()).to_csv(fh, index=False)
+        return n_rows
+
+    @staticmethod
+    def get_table_metadata_key(table_name: str, schema_name: str, dbase_engine: "sqlalchemy engine instance"):
+        """cache key of a reflected table: (engine url without password, schema.table)"""
+
+        return dbase_engine.url.render_as_string(hide_password=True), f'{schema_name}.{table_name}'
+
+    @staticmethod
+    def get_reflected_table(table_name: str, schema_name: str, dbase_engine: "sqlalchemy engine instance"):
+        """return the reflected table object, only querying the database catalog on a cache miss
+        output: sqlalchemy Table"""
+
+        cache_key = ProjUtil.get_table_metadata_key(table_name, schema_name, dbase_engine)
+        with ProjUtil.table_metadata_lock:
+            db_metadata = ProjUtil.table_metadata_cache.get(cache_key)
+            if db_metadata is None:
+                db_metadata = db.MetaData()
+                db.Table(table_name, db_metadata, schema=schema_name, autoload_with=dbase_engine)
+                ProjUtil.table_metadata_cache[cache_key] = db_metadata
+                logger.debug('TABLE OBJECT CREATED')
+                if ProjUtil.table_metadata_file:
+                    ProjUtil.save_table_metadata()
+        return db_metadata.tables[cache_key[1]]
+
+    @staticmethod
+    def invalidate_table_metadata(table_name: str = None, schema_name: str = None,
+                                  dbase_engine: "sqlalchemy engine instance" = None):
+        """forget reflected tables so that the next read reflects them again, e.g. after DDL
+        with no table_name every cached table is forgotten"""
+
+        with ProjUtil.table_metadata_lock:
+            if table_name is None:
+                ProjUtil.table_metadata_cache.clear()
+            else:
+                cache_key = ProjUtil.get_table_metadata_key(table_name, schema_name, dbase_engine)
+                ProjUtil.table_metadata_cache.pop(cache_key, None)
+            if ProjUtil.table_metadata_file:
+                ProjUtil.save_table_metadata()
+
+    @staticmethod
+    def configure_table_metadata_cache(cache_file: str, clear_cache=False):
+        """persist reflected tables to cache_file and load the tables reflected by earlier runs
+        clear_cache: if true, ignore and overwrite the existing file"""
+
+        ProjUtil.table_metadata_file = cache_file
+        with ProjUtil.table_metadata_lock:
+            ProjUtil.table_metadata_cache.clear()
+            if os.path.isfile(cache_file) and not clear_cache:
+                try:
+                    with open(cache_file, 'rb') as fh:
+                        ProjUtil.table_metadata_cache.update(pickle.load(fh))
+                except Exception as err:
+                    logger.warning('IGNORING UNREADABLE METADATA CACHE %s: %r', cache_file, err)
+            ProjUtil.save_table_metadata()
+
+    @staticmethod
+    def disable_table_metadata_cache():
+        """stop persisting reflected tables and forget those in memory"""
+
+        ProjUtil.table_metadata_file = None
+        ProjUtil.invalidate_table_metadata()
+
+    @staticmethod
+    def save_table_metadata():
+        """write the reflected tables to the metadata cache file, replacing it atomically
+        callers hold table_metadata_lock"""
+
+        tmp_file = f'{ProjUtil.table_metadata_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as fh:
+            pickle.dump(ProjUtil.table_metadata_cache, fh)
+        os.replace(tmp_file, ProjUtil.table_metadata_file)
+
     @staticmethod
     def concat_column_values(df: 'pd.DataFrame', column_names: 'list of columns' = list(), separator='-;-',
-                             delta_id='delta_id'):
+                             delta_id='delta_id', use_hash=False):
         """concatenate multiple columns into a single column
         df: dataframe containing parent dataset
         column_names: list of columns whose values are to be selected for concatenation
         separator: separating character
         delta_id: name of new column containing concatenated values
+        use_hash: if true, store a 64-bit fingerprint of the values instead (see hash_column_values)
 
         Output: dataframe including concatenated column"""
 
+        if use_hash:
+            return ProjUtil.hash_column_values(df, column_names=column_names, delta_id=delta_id)
+
         col_size = len(column_names)
         n_records = df.shape[0]
         if n_records > 0:
@@ -198,36 +780,145 @@ class ProjUtil:
                 df[delta_id] = df[column_names].astype(str).agg(func=f'{separator}'.join, axis='columns')
         else:
             df[delta_id] = ''
-        print(df.info())
+        logger.debug('%s', FrameSummary(df))
+        return df
+
+    @staticmethod
+    def holds_number_objects(ser: 'pandas series') -> bool:
+        """check that every non-null value of an object series is a number object (e.g. Decimal, int, float),
+        strings that only look like numbers do not count"""
+
+        if ser.dtype != object:
+            return False
+        inferred = pd.api.types.infer_dtype(ser, skipna=True)
+        if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal', 'empty'):
+            return True
+        if inferred in ('mixed-integer', 'mixed'):
+            return all(isinstance(val, numbers.Number) and not isinstance(val, bool) for val in ser.dropna())
+        return False
+
+    @staticmethod
+    def hash_column_values(df: 'pd.DataFrame', column_names: 'list of columns' = list(), delta_id='delta_id'):
+        """fingerprint each row with a 64-bit hash of the values in the given columns
+        numbers are hashed as float64 and every kind of missing value as NaN,
+        so 3, 3.0, Decimal('3'), None, NaN and pd.NA hash alike in source and database frames;
+        strings are hashed as strings, even when they look like numbers
+        df: dataframe containing parent dataset
+        column_names: columns to fingerprint (all columns if empty)
+        delta_id: name of new column containing the row fingerprints
+
+        Output: dataframe including fingerprint column"""
+
+        use_cols = column_names if len(column_names) else list(df.columns)
+
+        norm_cols = dict()
+        for col in use_cols:
+            ser = df[col]
+            if not (pd.api.types.is_numeric_dtype(ser) or pd.api.types.is_bool_dtype(ser)):
+                # object columns read from the database hold Decimal values for numeric columns;
+                # only columns whose values are number objects are hashed as numbers, so '001' and '1' stay apart
+                if not ProjUtil.holds_number_objects(ser):
+                    norm_cols[col] = ser.astype('string')
+                    continue
+                ser = pd.to_numeric(ser)
+            vals = ser.to_numpy(dtype='float64', na_value=np.nan)
+            # use a single NaN bit pattern and turn -0.0 into 0.0 so equal values hash alike
+            norm_cols[col] = np.where(np.isnan(vals), np.nan, vals) + 0.0
+
+        norm_df = pd.DataFrame(norm_cols, index=df.index, columns=use_cols)
+        df[delta_id] = pd.util.hash_pandas_object(norm_df, index=False).to_numpy()
         return df
 
     @staticmethod
     def dbase_conn_sqlalchemy(dbase_name: str, dbase_password: str, dbase_driver: str = 'postgresql',
-                              dbase_username: str = 'postgres', dbase_host: str = 'localhost', dbase_port: int = 5432):
+                              dbase_username: str = 'postgres', dbase_host: str = 'localhost', dbase_port: int = 5432,
+                              pool_settings: dict = None):
         """connect to a database session using sqlalchemy
+        the engine is borrowed from the process-wide registry, so only the first call per database pays
+        for engine creation; close the connection to hand it back to the pool
         output: dict(engine obj, connection obj)"""
 
-        # create instance of database session for the given database
-        db_engine = db.create_engine(
-            url=f'{dbase_driver}://{dbase_username}:{dbase_password}@{dbase_host}:{dbase_port}/{dbase_name}')
-        print('ENGINE CREATED')
+        # borrow the shared engine for the given database
+        db_engine = ProjUtil.get_shared_engine(dbase_name=dbase_name, dbase_password=dbase_password,
+                                               dbase_driver=dbase_driver, dbase_username=dbase_username,
+                                               dbase_host=dbase_host, dbase_port=dbase_port,
+                                               **(pool_settings or dict()))
 
         # connect to database instance
         db_conn = db_engine.connect()
-        print('CONNECTION CREATED')
+        logger.debug('CONNECTION CREATED')
 
         return {'engine': db_engine, 'connection': db_conn}
 
+    @staticmethod
+    def resolve_pg_settings(pg_settings: dict) -> dict:
+        """copy of pg_settings with the standard libpq environment variables taking precedence
+        PGUSER, PGPASSWORD, PGHOST, PGPORT, PGDATABASE"""
+
+        resolved = dict(pg_settings)
+        for env_name, key in ProjUtil.pg_env_overrides.items():
+            if os.environ.get(env_name):
+                resolved[key] = os.environ[env_name]
+        return resolved
+
+    @staticmethod
+    def dbase_conn_from_settings(pg_settings: dict):
+        """connect to the database described by a pg_var style dict, after environment overrides
+        output: dict(engine obj, connection obj)"""
+
+        pg_cred = ProjUtil.resolve_pg_settings(pg_settings)
+        pool_settings = {key: pg_cred[key] for key in ProjUtil.pool_setting_keys if key in pg_cred}
+        return ProjUtil.dbase_conn_sqlalchemy(dbase_name=pg_cred['db_name'], dbase_password=pg_cred['db_pwd'],
+                                              dbase_username=pg_cred['db_user'], dbase_host=pg_cred['db_host'],
+                                              dbase_port=pg_cred['db_port'], pool_settings=pool_settings)
+
+    @staticmethod
+    def get_shared_engine(dbase_name: str, dbase_password: str, dbase_driver: str = 'postgresql',
+                          dbase_username: str = 'postgres', dbase_host: str = 'localhost', dbase_port: int = 5432,
+                          pool_size: int = 5, max_overflow: int = 10, pool_pre_ping=True, pool_recycle: int = 1800):
+        """return the process-wide engine for the given database, creating it with a QueuePool on first use
+        pool settings only apply when the engine is created"""
+
+        db_url = db.engine.URL.create(drivername=dbase_driver, username=dbase_username, password=dbase_password,
+                                      host=dbase_host, port=int(dbase_port), database=dbase_name)
+        registry_key = db_url.render_as_string(hide_password=False)
+        with ProjUtil.engine_registry_lock:
+            if registry_key not in ProjUtil.engine_registry:
+                ProjUtil.engine_registry[registry_key] = db.create_engine(
+                    db_url, poolclass=db.pool.QueuePool, pool_size=pool_size, max_overflow=max_overflow,
+                    pool_pre_ping=pool_pre_ping, pool_recycle=pool_recycle)
+                logger.debug('ENGINE CREATED')
+            return ProjUtil.engine_registry[registry_key]
+
+    @staticmethod
+    def dispose_shared_engines():
+        """dispose every engine in the registry and empty it, closing all pooled connections"""
+
+        with ProjUtil.engine_registry_lock:
+            for db_engine in ProjUtil.engine_registry.values():
+                db_engine.dispose()
+            ProjUtil.engine_registry.clear()
+
     @staticmethod
     def run_delta_load_to_db(new_data: 'pd.DataFrame', old_data: "pd.DataFrame", delta_col_name: str,
                              database_table_name: str, db_engine: 'sqlalchemy create engine obj', db_schema: str,
-                             load_to_db=True):
+                             load_to_db=True, load_method: str = 'copy', chunk_rows: int = 50000,
+                             key_cols: 'list of columns' = None, swap_partitions=False,
+                             partition_col: str = 'quarter_ending'):
         """run delta load logic into a connected database
         :parameter
         new_data: dataframe containing fresh data
         old_data: dataframe containing data in the existing dbms table
         delta_col_name:identify the differences in values of the delta columns in both datasets
         load_to_db - if true, load data in the delta_load dataframe into the target dbms table
+        load_method - 'copy' streams rows with COPY FROM STDIN, 'multi' sends multi-row INSERTs,
+        None falls back to to_sql's row-by-row INSERTs
+        chunk_rows - rows per COPY buffer or INSERT batch
+        key_cols - natural key of the target table; if given, fresh rows are upserted on it (see upsert_frame)
+        so a revised row replaces the stored one instead of clashing with it
+        swap_partitions - if true, every partition_col value (quarter) with fresh rows is rebuilt from new_data
+        and swapped in for its partition of the list-partitioned target (see swap_quarter_partitions),
+        instead of loading only the fresh rows; ignored when load_to_db is false
 
         Logic:
         - get delta column data of both new and existing records
@@ -235,34 +926,328 @@ class ProjUtil:
         """
 
         # get fresh data's unique values in the delta column
-        new_set = set(new_data[delta_col_name])
-        print(f'\n{len(new_set)} new records found')
-        # print(new_set)
+        new_ids = new_data[delta_col_name]
+        logger.info('%d new records found', new_ids.nunique())
 
         # get existing data's unique values in the delta column
-        old_set = set(old_data[delta_col_name])
-        print(f'\n{len(old_set)} existing db records found')
-        # print(old_set)
+        old_ids = old_data[delta_col_name]
+        logger.info('%d existing db records found', old_ids.nunique())
 
-        # get values from new data not present in the existing db data
-        delta_id = new_set.difference(old_set)
-        # select only fresh data
-        # use_colnames = list(old_data.columns)
-        delta_load = new_data.loc[new_data[delta_col_name].isin(delta_id)]
+        # select only fresh data - rows whose delta values are not present in the existing db data
+        delta_load = new_data.loc[~new_ids.isin(old_ids)]
 
         # drop the delta_id before loading to the database
         delta_load = delta_load.drop(columns=delta_col_name)
-        print('\nDelta Load:')
-        print(delta_load.info())
+        logger.debug('Delta Load:\n%s', FrameSummary(delta_load))
 
         # load only fresh data into target database table
-        if load_to_db:
+        if load_to_db and swap_partitions:
+            swap_qtrs = delta_load[partition_col].drop_duplicates().tolist()
+            swap_rows = new_data.loc[new_data[partition_col].isin(swap_qtrs)].drop(columns=delta_col_name)
+            ProjUtil.swap_quarter_partitions(swap_rows, database_table_name, db_schema, db_engine,
+                                             partition_col=partition_col, load_method=load_method,
+                                             chunk_rows=chunk_rows)
+            logger.info("Delta load done!")
+        elif load_to_db and key_cols:
+            ProjUtil.upsert_frame(delta_load, database_table_name, db_schema, db_engine, key_cols,
+                                  load_method=load_method, chunk_rows=chunk_rows)
+            logger.info("Delta load done!")
+        elif load_to_db:
+            to_sql_method = ProjUtil.psql_insert_copy if load_method == 'copy' else load_method
             delta_load.to_sql(name=database_table_name, con=db_engine, schema=db_schema, if_exists='append',
-                              index=False)
-            print("Delta load done!")
+                              index=False, method=to_sql_method, chunksize=chunk_rows)
+            logger.info("Delta load done!")
 
         return delta_load
 
+    @staticmethod
+    def copy_csv_buffer(dbapi_conn: 'psycopg connection', table_name: str, schema_name: str,
+                        column_names: 'list of columns', csv_buf: 'io.StringIO'):
+        """stream a csv buffer into a table with COPY FROM STDIN through the raw psycopg connection
+        null cells must be written as \\N so that empty strings survive the load"""
+
+        target = f'{schema_name}.{table_name}' if schema_name else table_name
+        csv_buf.seek(0)
+        with dbapi_conn.cursor() as cur:
+            cur.copy_expert(f"COPY {target} ({', '.join(column_names)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                            csv_buf)
+
+    @staticmethod
+    def psql_insert_copy(table: 'pandas SQLTable', conn: 'sqlalchemy connection', keys: 'list of columns',
+                         data_iter: 'iterator of rows'):
+        """DataFrame.to_sql method that loads each chunk with COPY instead of INSERT statements"""
+
+        csv_buf = io.StringIO()
+        csv.writer(csv_buf, lineterminator='\n').writerows(['\\N' if val is None else val for val in row] for row in data_iter)
+        ProjUtil.copy_csv_buffer(conn.connection, table.name, table.schema, keys, csv_buf)
+
+    @staticmethod
+    def bulk_insert_frame(df: 'pd.DataFrame', table_name: str, schema_name: str, db_conn: 'sqlalchemy connection',
+                          load_method: str = 'copy', chunk_rows: int = 50000):
+        """insert the rows of a dataframe into an existing table through an open connection
+        schema_name: None for temp tables
+        load_method: 'copy' streams chunked csv buffers with COPY, anything else sends batched INSERTs
+        missing values are sent as NULL
+        output: number of rows inserted"""
+
+        if not len(df):
+            return 0
+        if load_method == 'copy':
+            for start in range(0, len(df), chunk_rows):
+                csv_buf = io.StringIO()
+                df.iloc[start:start + chunk_rows].to_csv(csv_buf, header=False, index=False, na_rep='\\N')
+                ProjUtil.copy_csv_buffer(db_conn.connection, table_name, schema_name, list(df.columns), csv_buf)
+            return len(df)
+        target = db.Table(table_name, db.MetaData(), *[db.Column(col) for col in df.columns], schema=schema_name)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        db_conn.execute(target.insert(), records)
+        return len(records)
+
+    @staticmethod
+    def swap_quarter_partitions(df: 'pd.DataFrame', table_name: str, schema_name: str,
+                                db_engine: 'sqlalchemy create engine obj', partition_col: str = 'quarter_ending',
+                                load_method: str = 'copy', chunk_rows: int = 50000) -> dict:
+        """replace whole quarters of a table list-partitioned on partition_col (see staging_ddl.sql)
+        quarters still held in the default partition are first moved to partitions of their own
+        (see split_default_partition), so the default partition stays empty and is never rewritten by a swap
+        each quarter in df is loaded into a fresh detached table <table>_q<quarter>, which then takes the place
+        of the quarter's partition: the old partition is detached and dropped and the new table is attached.
+        one transaction per quarter, so readers see either the old quarter or the new one; the check constraint
+        saves ATTACH a validation scan of the new table, leaving only the scan of the empty default partition
+        DETACH and ATTACH lock the parent table, so no other connection may hold an open transaction on it
+        output: {quarter: rows loaded}"""
+
+        target = f'{schema_name}.{table_name}'
+        ProjUtil.split_default_partition(table_name, schema_name, db_engine, partition_col=partition_col)
+        loaded = dict()
+        for qtr, qtr_rows in df.groupby(partition_col, sort=True):
+            part_name = f'{table_name}_q{qtr}'
+            new_part = f'{part_name}_new'
+            with db_engine.begin() as db_conn:
+                db_conn.execute(text(f"CREATE TABLE {schema_name}.{new_part} (LIKE {target} INCLUDING DEFAULTS "
+                                     f"INCLUDING GENERATED INCLUDING CONSTRAINTS)"))
+                db_conn.execute(text(f"ALTER TABLE {schema_name}.{new_part} ADD CONSTRAINT {new_part}_chk "
+                                     f"CHECK ({partition_col} IS NOT NULL AND {partition_col} = {int(qtr)})"))
+                loaded[qtr] = ProjUtil.bulk_insert_frame(qtr_rows, new_part, schema_name, db_conn,
+                                                         load_method=load_method, chunk_rows=chunk_rows)
+
+                # swap: the quarter is fully loaded, so the parent table is only locked for the steps below
+                old_part = db_conn.execute(text(
+                    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE i.inhparent = CAST(:target AS regclass) AND n.nspname = :schema AND c.relname = :part"),
+                    {'target': target, 'schema': schema_name, 'part': part_name}).scalar()
+                if old_part:
+                    db_conn.execute(text(f"ALTER TABLE {target} DETACH PARTITION {schema_name}.{part_name}"))
+                    db_conn.execute(text(f"DROP TABLE {schema_name}.{part_name}"))
+                db_conn.execute(text(f"ALTER TABLE {schema_name}.{new_part} RENAME TO {part_name}"))
+                db_conn.execute(text(f"ALTER TABLE {schema_name}.{part_name} RENAME CONSTRAINT {new_part}_chk "
+                                     f"TO {part_name}_chk"))
+                db_conn.execute(text(f"ALTER TABLE {target} ATTACH PARTITION {schema_name}.{part_name} "
+                                     f"FOR VALUES IN ({int(qtr)})"))
+            logger.info('Swapped in %d records for %s %s', loaded[qtr], partition_col, qtr)
+        return loaded
+
+    @staticmethod
+    def split_default_partition(table_name: str, schema_name: str, db_engine: 'sqlalchemy create engine obj',
+                                partition_col: str = 'quarter_ending') -> dict:
+        """move every quarter held in the default partition <table>_default of a table list-partitioned on
+        partition_col into a partition of its own <table>_q<quarter>, in one transaction
+        the default partition is detached while the quarters are copied out of it, then emptied and attached
+        again; nothing is done when it holds no rows
+        output: {quarter: rows moved}"""
+
+        target = f'{schema_name}.{table_name}'
+        default_part = f'{schema_name}.{table_name}_default'
+        moved = dict()
+        with db_engine.begin() as db_conn:
+            qtrs = db_conn.execute(text(f"SELECT DISTINCT {partition_col} FROM {default_part}")).scalars().all()
+            if not qtrs:
+                return moved
+
+            # generated columns (e.g. row_fingerprint) are computed again by each new partition
+            db_table = ProjUtil.get_reflected_table(table_name=table_name, schema_name=schema_name,
+                                                    dbase_engine=db_engine)
+            copy_cols = ', '.join(col.name for col in db_table.columns if col.computed is None)
+            db_conn.execute(text(f"ALTER TABLE {target} DETACH PARTITION {default_part}"))
+            for qtr in sorted(qtrs):
+                part_name = f'{table_name}_q{qtr}'
+                db_conn.execute(text(f"CREATE TABLE {schema_name}.{part_name} (LIKE {target} INCLUDING DEFAULTS "
+                                     f"INCLUDING GENERATED INCLUDING CONSTRAINTS)"))
+                db_conn.execute(text(f"ALTER TABLE {schema_name}.{part_name} ADD CONSTRAINT {part_name}_chk "
+                                     f"CHECK ({partition_col} IS NOT NULL AND {partition_col} = {int(qtr)})"))
+                moved[qtr] = db_conn.execute(text(f"INSERT INTO {schema_name}.{part_name} ({copy_cols}) "
+                                                  f"SELECT {copy_cols} FROM {default_part} "
+                                                  f"WHERE {partition_col} = {int(qtr)}")).rowcount
+                db_conn.execute(text(f"ALTER TABLE {target} ATTACH PARTITION {schema_name}.{part_name} "
+                                     f"FOR VALUES IN ({int(qtr)})"))
+            db_conn.execute(text(f"TRUNCATE {default_part}"))
+            db_conn.execute(text(f"ALTER TABLE {target} ATTACH PARTITION {default_part} DEFAULT"))
+        logger.info('Moved %d quarters out of %s: %s', len(moved), default_part, moved)
+        return moved
+
+    @staticmethod
+    def sql_row_fingerprint(column_names: 'list of columns', table_alias: str) -> str:
+        """sql expression for an md5 fingerprint of a row over the given columns
+        null and empty string render differently in the row text, so the fingerprint is null-safe"""
+
+        row_cols = ', '.join(f'{table_alias}.{col}' for col in column_names)
+        return f'md5(ROW({row_cols})::text)'
+
+    @staticmethod
+    def dedupe_on_key(df: 'pd.DataFrame', key_cols: 'list of columns') -> 'pd.DataFrame':
+        """keep the first row of every natural key value, in the dataframe's current order
+        an upsert can only touch each key once per statement
+        output: deduplicated dataframe"""
+
+        dup_rows = df.duplicated(subset=key_cols, keep='first')
+        if dup_rows.any():
+            logger.warning('Dropped %d records repeating a (%s) key', dup_rows.sum(), ", ".join(key_cols))
+        return df.loc[~dup_rows]
+
+    @staticmethod
+    def sql_upsert_clause(column_names: 'list of columns', key_cols: 'list of columns') -> str:
+        """ON CONFLICT clause overwriting the other columns of the stored row that has the same key"""
+
+        set_cols = ', '.join(f'{col} = EXCLUDED.{col}' for col in column_names if col not in key_cols)
+        on_conflict = f"ON CONFLICT ({', '.join(key_cols)})"
+        return f"{on_conflict} DO UPDATE SET {set_cols}" if set_cols else f"{on_conflict} DO NOTHING"
+
+    @staticmethod
+    def upsert_frame(df: 'pd.DataFrame', table_name: str, schema_name: str,
+                     db_engine: 'sqlalchemy create engine obj', key_cols: 'list of columns',
+                     load_method: str = 'copy', chunk_rows: int = 50000) -> int:
+        """insert the rows of a dataframe, updating the stored rows that have the same natural key
+        the rows are bulk loaded into a temp table first, then merged with one INSERT ... ON CONFLICT
+        df must hold each key once (see dedupe_on_key)
+        output: number of rows inserted or updated"""
+
+        if not len(df):
+            return 0
+        load_cols = list(df.columns)
+        col_list = ', '.join(load_cols)
+        tmp_table = f'tmp_{table_name}_upsert'
+        with db_engine.begin() as db_conn:
+            db_conn.execute(text(f"CREATE TEMP TABLE {tmp_table} (LIKE {schema_name}.{table_name}) ON COMMIT DROP"))
+            ProjUtil.bulk_insert_frame(df, tmp_table, None, db_conn, load_method=load_method, chunk_rows=chunk_rows)
+            n_upserted = db_conn.execute(text(
+                f"INSERT INTO {schema_name}.{table_name} ({col_list}) SELECT {col_list} FROM {tmp_table} "
+                f"{ProjUtil.sql_upsert_clause(load_cols, key_cols)}")).rowcount
+        logger.info('Upserted %d records into %s.%s', n_upserted, schema_name, table_name)
+        return n_upserted
+
+    @staticmethod
+    def run_db_delta_load(new_data: 'pd.DataFrame', database_table_name: str,
+                          db_engine: 'sqlalchemy create engine obj', db_schema: str, load_method: str = 'copy',
+                          chunk_rows: int = 50000, delete_obsolete=False,
+                          scope_cols: 'list of columns' = None, key_cols: 'list of columns' = None) -> dict:
+        """run delta load logic inside the database instead of pulling the target table into pandas
+        :parameter
+        new_data: dataframe containing fresh data, with columns matching the target table
+        load_method, chunk_rows: passed to bulk_insert_frame for the temp table load
+        delete_obsolete: if true, delete the obsolete target rows instead of only counting them
+        scope_cols: if given, only target rows sharing their values in these columns with a fresh row
+        (e.g. the reloaded quarters) can be obsolete
+        key_cols: natural key of a keyed staging table (primary key plus stored row_fingerprint column);
+        if given, rows are compared on the indexed stored fingerprint, a changed row is updated in place
+        on its key, and only target rows whose key is absent from the fresh data are obsolete.
+        new_data must then hold each key once (see dedupe_on_key)
+
+        Logic:
+        - bulk load fresh data into a temp table shaped like the target table
+        - count (or delete) target rows whose fingerprint (or key) is absent from the fresh data
+        - insert (or upsert) only temp rows whose fingerprint is absent from the target table
+        all in one transaction; the temp table is dropped on commit
+        output: dict of inserted count, obsolete count and the inserted rows (delta_load)"""
+
+        load_cols = list(new_data.columns)
+        col_list = ', '.join(load_cols)
+        target = f'{db_schema}.{database_table_name}'
+        tmp_table = f'tmp_{database_table_name}_delta'
+        if key_cols:
+            # the temp table computes the same generated fingerprint as the target
+            tmp_like = f"LIKE {target} INCLUDING GENERATED"
+            new_fp, old_fp = f'n.{ProjUtil.stored_fingerprint_col}', f'o.{ProjUtil.stored_fingerprint_col}'
+            obsolete_match = ' AND '.join(f'n.{col} = o.{col}' for col in key_cols)
+            upsert_clause = ProjUtil.sql_upsert_clause(load_cols, key_cols) + ' '
+        else:
+            tmp_like = f"LIKE {target}"
+            new_fp = ProjUtil.sql_row_fingerprint(load_cols, 'n')
+            old_fp = ProjUtil.sql_row_fingerprint(load_cols, 'o')
+            obsolete_match = f'{new_fp} = {old_fp}'
+            upsert_clause = ''
+
+        with db_engine.begin() as db_conn:
+            db_conn.execute(text(f"CREATE TEMP TABLE {tmp_table} ({tmp_like}) ON COMMIT DROP"))
+            n_new = ProjUtil.bulk_insert_frame(new_data, tmp_table, None, db_conn, load_method=load_method,
+                                               chunk_rows=chunk_rows)
+            logger.info('%d new records found', n_new)
+
+            # handle obsolete rows before the insert so fresh rows are not compared against themselves
+            obsolete_filter = f"WHERE NOT EXISTS (SELECT 1 FROM {tmp_table} n WHERE {obsolete_match})"
+            if scope_cols:
+                scope_list = ', '.join(scope_cols)
+                obsolete_filter += (f" AND ({', '.join('o.' + col for col in scope_cols)}) IN "
+                                    f"(SELECT DISTINCT {scope_list} FROM {tmp_table})")
+            if delete_obsolete:
+                n_obsolete = db_conn.execute(text(f"DELETE FROM {target} o {obsolete_filter}")).rowcount
+                logger.info('Deleted %d old records from database', n_obsolete)
+            else:
+                n_obsolete = db_conn.execute(text(f"SELECT count(*) FROM {target} o {obsolete_filter}")).scalar()
+
+            inserted = db_conn.execute(text(
+                f"INSERT INTO {target} ({col_list}) "
+                f"SELECT {', '.join('n.' + col for col in load_cols)} FROM {tmp_table} n "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {target} o WHERE {old_fp} = {new_fp}) "
+                f"{upsert_clause}RETURNING {col_list}"))
+            delta_load = pd.DataFrame(inserted.fetchall(), columns=load_cols)
+
+        logger.debug('Delta Load:\n%s', FrameSummary(delta_load))
+        logger.info("Delta load done!")
+        return {'inserted': len(delta_load), 'obsolete': n_obsolete, 'delta_load': delta_load}
+
+    @staticmethod
+    def sync_delta_to_db(delta_load: 'pd.DataFrame', obsolete_rows: 'pd.DataFrame', database_table_name: str,
+                         db_engine: 'sqlalchemy create engine obj', db_schema: str, load_method: str = 'copy',
+                         chunk_rows: int = 50000, key_cols: 'list of columns' = None) -> dict:
+        """apply a delta found in pandas (run_delta_load_to_db with load_to_db=False) in one transaction
+        :parameter
+        delta_load: fresh rows to insert into the target table
+        obsolete_rows: target rows to delete, as read from the database
+        key_cols: natural key of the target table; if given, obsolete rows are deleted by key (primary key
+        lookups) instead of by fingerprint
+
+        Logic:
+        - bulk load the obsolete rows into a temp table shaped like the target table
+        - delete every target row whose fingerprint (or key) matches an obsolete row, in one statement
+        - bulk load the fresh rows into the target table
+        readers see either the old table or the fully revised one
+        output: dict of deleted and inserted counts"""
+
+        target = f'{db_schema}.{database_table_name}'
+        tmp_table = f'tmp_{database_table_name}_obsolete'
+        n_deleted = 0
+
+        with db_engine.begin() as db_conn:
+            if len(obsolete_rows):
+                del_cols = list(obsolete_rows.columns)
+                db_conn.execute(text(f"CREATE TEMP TABLE {tmp_table} (LIKE {target}) ON COMMIT DROP"))
+                ProjUtil.bulk_insert_frame(obsolete_rows, tmp_table, None, db_conn, load_method=load_method,
+                                           chunk_rows=chunk_rows)
+                if key_cols:
+                    key_match = ' AND '.join(f'o.{col} = n.{col}' for col in key_cols)
+                    del_stmt = f"DELETE FROM {target} o USING {tmp_table} n WHERE {key_match}"
+                else:
+                    del_stmt = (f"DELETE FROM {target} o WHERE {ProjUtil.sql_row_fingerprint(del_cols, 'o')} IN "
+                                f"(SELECT {ProjUtil.sql_row_fingerprint(del_cols, 'n')} FROM {tmp_table} n)")
+                n_deleted = db_conn.execute(text(del_stmt)).rowcount
+            n_inserted = ProjUtil.bulk_insert_frame(delta_load, database_table_name, db_schema, db_conn,
+                                                    load_method=load_method, chunk_rows=chunk_rows)
+
+        logger.info('Deleted %d old records from database', n_deleted)
+        logger.info('Inserted %d fresh records into database', n_inserted)
+        return {'deleted': n_deleted, 'inserted': n_inserted}
+
     @staticmethod
     def add_constant_col(df: 'pandas dataframe', new_colname: str = 'row_count', const_val: 'any type' = 1):
         """engineer an additional column with constant value to given dataframe object
@@ -272,14 +1257,262 @@ class ProjUtil:
         # print(df.info())
         return df
 
+    @staticmethod
+    def enable_workbook_cache(sheet_names: 'list of sheet names'):
+        """parse all the given sheets the first time a workbook is opened
+        so that later pull_file_xl calls on the same workbook are served from memory"""
+
+        ProjUtil.workbook_sheets = list(sheet_names)
+        ProjUtil.workbook_cache.clear()
+        ProjUtil.workbook_failures.clear()
+
+    @staticmethod
+    def clear_workbook_cache():
+        """release all cached sheets and switch the workbook cache off"""
+
+        ProjUtil.workbook_sheets = None
+        ProjUtil.workbook_cache.clear()
+        ProjUtil.workbook_failures.clear()
+
+    @staticmethod
+    def configure_sheet_cache(cache_dir: str, max_mb: int = 512, clear_cache=False):
+        """store parsed sheets under cache_dir so that unchanged source files are not parsed again
+        max_mb: size cap of the cache folder, least recently used entries are evicted beyond it
+        clear_cache: if true, remove all existing entries first"""
+
+        os.makedirs(cache_dir, exist_ok=True)
+        ProjUtil.sheet_cache_dir = cache_dir
+        ProjUtil.sheet_cache_max_bytes = max_mb * 1024 ** 2
+        if clear_cache:
+            ProjUtil.clear_sheet_cache(cache_dir)
+
+        # reuse the content hashes of files whose mtime and size are unchanged since the last run
+        hash_file = os.path.join(cache_dir, 'file_hashes.json')
+        ProjUtil.sheet_cache_hashes = dict()
+        if os.path.isfile(hash_file):
+            try:
+                with open(hash_file, encoding='utf8') as fh:
+                    file_hashes = json.load(fh)
+                if not isinstance(file_hashes, dict):
+                    raise ValueError(f'expected a json object, got {type(file_hashes).__name__}')
+                ProjUtil.sheet_cache_hashes = file_hashes
+            except Exception as err:
+                logger.warning('IGNORING UNREADABLE SHEET CACHE HASHES %s: %r', hash_file, err)
+
+    @staticmethod
+    def disable_sheet_cache():
+        """stop reading from and writing to the on-disk sheet cache"""
+
+        ProjUtil.sheet_cache_dir = None
+        ProjUtil.sheet_cache_hashes = dict()
+
+    @staticmethod
+    def clear_sheet_cache(cache_dir: str):
+        """remove every cached sheet and file hash in the given cache folder"""
+
+        n_removed = 0
+        if not os.path.isdir(cache_dir):
+            return
+        for fname in os.listdir(cache_dir):
+            if fname.endswith('.pkl') or fname == 'file_hashes.json':
+                os.remove(os.path.join(cache_dir, fname))
+                n_removed += 1
+        if cache_dir == ProjUtil.sheet_cache_dir:
+            ProjUtil.sheet_cache_hashes = dict()
+        logger.info('SHEET CACHE CLEARED: %d files removed', n_removed)
+
+    @staticmethod
+    def get_file_hash(file_path: str) -> str:
+        """sha256 of the file content, only recomputed when the file's mtime or size changes
+        output: hex digest"""
+
+        file_stat = os.stat(file_path)
+        known = ProjUtil.sheet_cache_hashes.get(file_path)
+        if known is not None and known['mtime'] == file_stat.st_mtime and known['size'] == file_stat.st_size:
+            return known['sha256']
+
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1024 ** 2), b''):
+                file_hash.update(block)
+        ProjUtil.sheet_cache_hashes[file_path] = {'mtime': file_stat.st_mtime,
+                                                  'size': file_stat.st_size,
+                                                  'sha256': file_hash.hexdigest()}
+        ProjUtil.sheet_cache_changed.add(file_path)
+        ProjUtil.save_sheet_cache_hashes()
+
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def save_sheet_cache_hashes():
+        """write the known file hashes to the cache folder
+        the file is replaced atomically so an interrupted run leaves a readable file behind
+        worker processes skip the write: only the parent, which merges their hashes, owns the file"""
+
+        if ProjUtil.sheet_cache_defer_save:
+            return
+        hash_file = os.path.join(ProjUtil.sheet_cache_dir, 'file_hashes.json')
+        tmp_file = f'{hash_file}.{os.getpid()}.tmp'
+        with ProjUtil.sheet_cache_lock:
+            with open(tmp_file, 'w', encoding='utf8') as fh:
+                json.dump(dict(ProjUtil.sheet_cache_hashes), fh)
+            os.replace(tmp_file, hash_file)
+
+    @staticmethod
+    def collect_sheet_cache_hashes() -> dict:
+        """hash entries changed since the last call
+        output: {file path: hash entry}"""
+
+        changed = {fpath: ProjUtil.sheet_cache_hashes[fpath] for fpath in ProjUtil.sheet_cache_changed
+                   if fpath in ProjUtil.sheet_cache_hashes}
+        ProjUtil.sheet_cache_changed.clear()
+        return changed
+
+    @staticmethod
+    def merge_sheet_cache_hashes(new_hashes: dict):
+        """take over the hash entries computed by a worker process and write them to the cache folder"""
+
+        if not len(new_hashes) or ProjUtil.sheet_cache_dir is None:
+            return
+        ProjUtil.sheet_cache_hashes.update(new_hashes)
+        ProjUtil.save_sheet_cache_hashes()
+
+    @staticmethod
+    def get_sheet_cache_path(file_path: str, sheet_name: str, skiprows: int = 0) -> str:
+        """location of the cache entry for the given file content, sheet and skiprows"""
+
+        file_hash = ProjUtil.get_file_hash(file_path)
+        sheet_tag = re.sub(r'\W', '_', sheet_name)
+        return os.path.join(ProjUtil.sheet_cache_dir, f'{file_hash[:24]}_{sheet_tag}_{skiprows}.pkl')
+
+    @staticmethod
+    def read_sheet_cache(file_path: str, sheet_name: str, skiprows: int = 0):
+        """load a parsed sheet from the on-disk cache
+        an entry that cannot be loaded (e.g. half synced, or pickled by another pandas version) is removed
+        and treated as a cache miss, so the source file is parsed again
+        entries are pickles, and unpickling can run arbitrary code: keep the cache folder writable only by
+        trusted users, or point sheet_cache_fdr outside a shared folder
+        output: dataframe, or None on a cache miss"""
+
+        entry_path = ProjUtil.get_sheet_cache_path(file_path, sheet_name, skiprows)
+        if not os.path.isfile(entry_path):
+            return None
+
+        # touch the entry so that eviction removes the least recently used ones first;
+        # another process may evict it in between, which is a cache miss
+        try:
+            os.utime(entry_path)
+            return pd.read_pickle(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.warning('REMOVING UNREADABLE SHEET CACHE ENTRY %s: %r', entry_path, err)
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            return None
+
+    @staticmethod
+    def write_sheet_cache(file_path: str, sheet_name: str, df: 'pandas dataframe', skiprows: int = 0):
+        """store a parsed sheet in the on-disk cache and enforce the cache size cap"""
+
+        entry_path = ProjUtil.get_sheet_cache_path(file_path, sheet_name, skiprows)
+        tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, entry_path)
+        ProjUtil.evict_sheet_cache()
+
+    @staticmethod
+    def evict_sheet_cache():
+        """remove least recently used cache entries until the cache fits its size cap"""
+
+        # worker processes evict concurrently, so entries may vanish between listing, stat and remove
+        entries = list()
+        for fname in os.listdir(ProjUtil.sheet_cache_dir):
+            if fname.endswith('.pkl'):
+                try:
+                    entry_stat = os.stat(os.path.join(ProjUtil.sheet_cache_dir, fname))
+                except FileNotFoundError:
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, fname))
+
+        cache_size = sum(entry[1] for entry in entries)
+        for last_used, entry_size, fname in sorted(entries):
+            if cache_size <= ProjUtil.sheet_cache_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(ProjUtil.sheet_cache_dir, fname))
+            except FileNotFoundError:
+                pass
+            cache_size -= entry_size
+            logger.debug('Evicted %s from sheet cache', fname)
+
+    @staticmethod
+    def pull_workbook_xl(file_path: str, sheet_names: 'list of sheet names', skiprows: int = 0) -> dict:
+        """read several sheets of the excel file in the given file location with one parse
+        sheets found in the on-disk sheet cache are not parsed again
+        sheets not present in the file are skipped
+        output: dict(sheet name: dataframe)"""
+
+        xl_sheets = dict()
+        if ProjUtil.sheet_cache_dir is not None:
+            for sh in sheet_names:
+                cached_df = ProjUtil.read_sheet_cache(file_path, sh, skiprows)
+                if cached_df is not None:
+                    xl_sheets[sh] = cached_df
+            # remember sheets absent from the file so it is not reopened just to find that out again
+            missing_sheets = ProjUtil.sheet_cache_hashes[file_path].get('missing_sheets', list())
+            sheet_names = [sh for sh in sheet_names if sh not in xl_sheets and sh not in missing_sheets]
+            if not len(sheet_names):
+                return xl_sheets
+
+        with pd.ExcelFile(file_path) as xl_book:
+            use_sheets = [sh for sh in sheet_names if sh in xl_book.sheet_names]
+            parsed_sheets = pd.read_excel(io=xl_book, sheet_name=use_sheets, skiprows=skiprows)
+
+        if ProjUtil.sheet_cache_dir is not None:
+            for sh, parsed_df in parsed_sheets.items():
+                ProjUtil.write_sheet_cache(file_path, sh, parsed_df, skiprows)
+            missing_sheets = missing_sheets + [sh for sh in sheet_names if sh not in use_sheets]
+            ProjUtil.sheet_cache_hashes[file_path]['missing_sheets'] = missing_sheets
+            ProjUtil.sheet_cache_changed.add(file_path)
+            ProjUtil.save_sheet_cache_hashes()
+
+        xl_sheets.update(parsed_sheets)
+        return xl_sheets
+
     @staticmethod
     def pull_file_xl(file_path: str, sheet_name: str, skiprows: int = 0):
         """read excel file in the given file location
+        when the workbook cache is enabled, the file is parsed once for all cached sheets
+        and the returned dataframe is shared, so it must not be modified in place
         output: dataframe"""
 
-        xl_file = pd.read_excel(io=file_path, sheet_name=sheet_name, skiprows=skiprows)  # , engine='openpyxl')
-
-        return xl_file
+        if ProjUtil.workbook_sheets is None:
+            xl_file = None
+            if ProjUtil.sheet_cache_dir is not None:
+                xl_file = ProjUtil.read_sheet_cache(file_path, sheet_name, skiprows)
+            if xl_file is None:
+                xl_file = pd.read_excel(io=file_path, sheet_name=sheet_name, skiprows=skiprows)  # , engine='openpyxl')
+                if ProjUtil.sheet_cache_dir is not None:
+                    ProjUtil.write_sheet_cache(file_path, sheet_name, xl_file, skiprows)
+            return xl_file
+
+        cache_key = (file_path, skiprows)
+        if cache_key in ProjUtil.workbook_failures:
+            raise ValueError(f'{os.path.basename(file_path)} failed to parse: '
+                             f'{ProjUtil.workbook_failures[cache_key]!r}')
+        if cache_key not in ProjUtil.workbook_cache:
+            logger.debug('Parsing workbook %s', os.path.basename(file_path))
+            ProjUtil.workbook_cache[cache_key] = ProjUtil.pull_workbook_xl(file_path=file_path,
+                                                                           sheet_names=ProjUtil.workbook_sheets,
+                                                                           skiprows=skiprows)
+        xl_sheets = ProjUtil.workbook_cache[cache_key]
+        if sheet_name not in xl_sheets:
+            xl_sheets[sheet_name] = pd.read_excel(io=file_path, sheet_name=sheet_name, skiprows=skiprows)
+
+        return xl_sheets[sheet_name]
 
     @staticmethod
     def drop_empty_axis(df: 'pandas dataframe', axis="columns", valid_row_indicator: 'integer' = 1, show_progress=True):
@@ -290,727 +1523,92 @@ class ProjUtil:
         df = df.dropna(axis=axis, thresh=valid_row_indicator)
 
         if (show_progress == True) and (axis == 'columns'):
-            print('\nEMPTY COLUMNS REMOVED\n')
+            logger.debug('EMPTY COLUMNS REMOVED')
         elif (show_progress == True) and (axis == 'rows'):
             df = df.reset_index(drop=True)
-            print('\nEMPTY ROWS REMOVED\n')
+            logger.debug('EMPTY ROWS REMOVED')
 
         return df
 
     @staticmethod
-    def clean_tab_a1(abs_file_path: str, sheet_name='A1',
-                     skiprows=1, assign_col='quarter_ending',
-                     assign_val=202406):
-
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper()+': '+str(assign_val)}")
-
-        # extract data from xl file into dataframe
-        xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        # filter out blank records - completely empty records
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        # filter out useless columns - containing mostly blank roecords
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        # print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        # print(df.head(15))
-
-        # map columns to appropriate column names
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id', 'local_authority', 'initial_assessments', 'owed_prevention_or_relief_duty',
-                        'prevention_duty_owed', 'relief_duty_owed', 'households_in_area_000s']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      "Total number of households assessed1,2": "initial_assessments",
-                      "Total households assessed as owed a duty": "owed_prevention_or_relief_duty",
-                      "Threatened with homelessness - Prevention duty owed": "prevention_duty_owed",
-                      "Homeless - Relief duty owed": "relief_duty_owed",
-                      "Unnamed: 15": "households_in_area_000s"}
-        # print(list(col_mapper.values()))
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        # remove duplicate records
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # retain only relevant columns
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
-        start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        # filter out all records where system_id is blank
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        # filter out useless rows - containing mostly blank records
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
+    def flag_la_groups(df: 'pandas dataframe', la_col: str = 'local_authority', la_groups: dict = None,
+                       categorical_la=False):
+        """add a 1/0 int8 membership column for every group of la_groups, {flag column: member local authorities}
+        (see etl_settings la_groups); a local authority missing from a group, or a blank one, is flagged 0
+        the local authorities are matched once as categorical codes, so each flag is one vectorized lookup
+        categorical_la: if true, la_col is kept as the categorical column
+        output: pandas dataframe"""
 
-        # engineer quarter indicator feature
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        print(added_quarter_indicator.info())
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = ['initial_assessments', 'owed_prevention_or_relief_duty',
-                     'prevention_duty_owed', 'relief_duty_owed',
-                    'households_in_area_000s']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = ['initial_assessments', 'owed_prevention_or_relief_duty',
-                     'prevention_duty_owed', 'relief_duty_owed']
-        fltg_cols = ['households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols, flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
+        la_cat = df[la_col] if isinstance(df[la_col].dtype, pd.CategoricalDtype) else df[la_col].astype('category')
+        la_codes = la_cat.cat.codes.to_numpy()
+        for flag_col, group_las in (la_groups or dict()).items():
+            group_codes = la_cat.cat.categories.get_indexer(group_las)
+            df[flag_col] = np.isin(la_codes, group_codes[group_codes >= 0]).astype('int8')
+        if categorical_la:
+            df[la_col] = la_cat
         return df
 
     @staticmethod
-    def clean_tab_a2(abs_file_path: str, sheet_name='A1', skiprows=1, assign_col='quarter_ending', assign_val=202406, prefix='prevention'):
-
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper() + ': ' + str(assign_val)}")
-        xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        # print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        # print(df.head(15))
-
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id', 'local_authority', f'{prefix}_duty_owed', 'family_or_friend_terminations',
-                        'ast_private_rented_terminations',
-                        'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
-                        'social_rented_tenancy_terminations',
-                        'supported_housing_terminations', 'non_ast_private_rented_terminations',
-                        'other_violence_or_harassment_terminations',
-                        'institution_departures', 'home_office_asylum_support_terminations',
-                        'new_home_for_illness_or_disability',
-                        'loss_of_placement_or_sponsorship', 'for_other_or_unknown_reasons']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      "Unnamed: 4": f"{prefix}_duty_owed",
-                      "Family or friends no longer willing or able to accommodate": "family_or_friend_terminations",
-                      "End of private rented tenancy - assured shorthold": "ast_private_rented_terminations",
-                      "Domestic abuse": "domestic_abuse_terminations",
-                      "Non-violent relationship breakdown with partner": "non_violent_relationship_breakdown_terminations",
-                      "End of social rented tenancy": "social_rented_tenancy_terminations",
-                      "Eviction from supported housing": "supported_housing_terminations",
-                      "End of private rented tenancy - not assured shorthold": "non_ast_private_rented_terminations",
-                      "Other violence or harrassment": "other_violence_or_harassment_terminations",
-                      "Left institution with no accommodation available": "institution_departures",
-                      "Required to leave accommodation provided by Home Office as asylum support": "home_office_asylum_support_terminations",
-                      "Home no longer suitable - disability / ill health": "new_home_for_illness_or_disability",
-                      "Unnamed: 56": "loss_of_placement_or_sponsorship",
-                      "Other reasons / not known6": "for_other_or_unknown_reasons"}
-        # print(list(col_mapper.values()))
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # sel_cols = [col_list[i] for i in range(len(col_list)) if "Unnamed:" not in col_list[i]]
-        # print(sel_cols)
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
-        start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        # print(added_quarter_indicator.info())
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = [f'{prefix}_duty_owed', 'family_or_friend_terminations',
-                    'ast_private_rented_terminations',
-                    'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
-                    'social_rented_tenancy_terminations',
-                    'supported_housing_terminations', 'non_ast_private_rented_terminations',
-                    'other_violence_or_harassment_terminations',
-                    'institution_departures', 'home_office_asylum_support_terminations',
-                    'new_home_for_illness_or_disability',
-                    'loss_of_placement_or_sponsorship', 'for_other_or_unknown_reasons']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = [f'{prefix}_duty_owed', 'family_or_friend_terminations',
-                    'ast_private_rented_terminations',
-                    'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
-                    'social_rented_tenancy_terminations',
-                    'supported_housing_terminations', 'non_ast_private_rented_terminations',
-                    'other_violence_or_harassment_terminations',
-                    'institution_departures', 'home_office_asylum_support_terminations',
-                    'new_home_for_illness_or_disability',
-                    'loss_of_placement_or_sponsorship', 'for_other_or_unknown_reasons']
-        # fltg_cols = ['total_households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols)#, flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
-        return df
+    def compile_sheet_spec(use_func: str, prefix: str = 'prevention') -> dict:
+        """resolve the cleaning spec of a sheet for the given duty type prefix
+        output: dict(col_mapper, sel_colnames, metric_cols, int_cols, flt_cols)"""
+
+        spec_key = (use_func, prefix)
+        if spec_key not in ProjUtil.compiled_sheet_specs:
+            sheet_spec = ProjUtil.sheet_specs[use_func]
+            col_mapper = {src_col.format(prefix=prefix): col.format(prefix=prefix)
+                          for src_col, col in sheet_spec['col_mapper'].items()}
+            sel_colnames = list(col_mapper.values())
+            flt_cols = [col.format(prefix=prefix) for col in sheet_spec['flt_cols']]
+            metric_cols = [col for col in sel_colnames if col not in ['system_id', 'local_authority']]
+            ProjUtil.compiled_sheet_specs[spec_key] = {'col_mapper': col_mapper,
+                                                       'sel_colnames': sel_colnames,
+                                                       'metric_cols': metric_cols,
+                                                       'int_cols': [col for col in metric_cols if col not in flt_cols],
+                                                       'flt_cols': flt_cols}
+
+        return ProjUtil.compiled_sheet_specs[spec_key]
 
     @staticmethod
-    def clean_tab_p1(abs_file_path: str, sheet_name='A1', skiprows=1, assign_col='quarter_ending', assign_val=202406,
-                     prefix="prevention"):
+    def clean_tab(abs_file_path: str, use_func='a1', sheet_name='A1', skiprows=1, assign_col='quarter_ending',
+                  assign_val=202406, prefix='prevention', la_groups: dict = None, categorical_la=False):
+        """clean one sheet of a quarterly DLUHC file as described by its entry in sheet_specs
+        use_func: key of the sheet in sheet_specs
+        prefix: duty type (prevention or relief) used by the a2, p1 and r1 specs
+        la_groups: {flag column: member local authorities}, each group adds a 1/0 int8 flag (see flag_la_groups)
+        categorical_la: if true, local_authority is returned as a categorical column
+        output: dataframe"""
 
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper() + ': ' + str(assign_val)}")
+        sheet_spec = ProjUtil.compile_sheet_spec(use_func, prefix)
+        logger.debug('NOW CLEANING: %s %s: %s', sheet_name, assign_col.upper(), assign_val)
+
+        # extract data from xl file into dataframe
         xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        # print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        # print(df.head(15))
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id', 'local_authority', f'{prefix}_duty_ended',
-                        'secured_accommodation', 'homelessness',
-                        'contact_lost', 'no_further_action_after_56days',
-                        'applicant_withdrew_or_deceased', 'no_longer_eligible',
-                        'rejected_offered_accommodation', 'uncooperative', 'not_known']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      f"Total number of households where {prefix} duty ended1,2": f"{prefix}_duty_ended",
-                      "Secured accommodation for 6+ months": "secured_accommodation",
-                      "Homeless (including intentionally homeless)": "homelessness",
-                      "Contact lost": "contact_lost",
-                      "56 days elapsed and no further action": "no_further_action_after_56days",
-                      "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
-                      "No longer eligible": "no_longer_eligible",
-                      "Refused suitable accommodation offer": "rejected_offered_accommodation",
-                      "Refused to cooperate": "uncooperative",
-                      "Not known6": "not_known"}
-        print(list(col_mapper.values()))
-
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # sel_cols = [col_list[i] for i in range(len(col_list)) if "Unnamed:" not in col_list[i]]
-        # print(sel_cols)
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
-        start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        # print(added_quarter_indicator.info())
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = [f'{prefix}_duty_ended',
-                    'secured_accommodation', 'homelessness',
-                    'contact_lost', 'no_further_action_after_56days',
-                    'applicant_withdrew_or_deceased', 'no_longer_eligible',
-                    'rejected_offered_accommodation', 'uncooperative', 'not_known']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = [f'{prefix}_duty_ended',
-                    'secured_accommodation', 'homelessness',
-                    'contact_lost', 'no_further_action_after_56days',
-                    'applicant_withdrew_or_deceased', 'no_longer_eligible',
-                    'rejected_offered_accommodation', 'uncooperative', 'not_known']
-        # fltg_cols = ['total_households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols)  # , flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
-        return df
 
-    @staticmethod
-    def clean_tab_r1(abs_file_path: str, sheet_name='A1', skiprows=1, assign_col='quarter_ending', assign_val=202406,
-                     prefix="prevention"):
+        # filter out blank records and mostly blank columns, map columns to appropriate column names,
+        # remove duplicate records and retain only relevant columns
+        df = (ProjUtil.drop_empty_axis(xl_df, axis='rows', valid_row_indicator=1)
+              .pipe(ProjUtil.drop_empty_axis, valid_row_indicator=20)
+              .rename(columns=sheet_spec['col_mapper'])
+              .drop_duplicates()
+              [sheet_spec['sel_colnames']])
 
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper() + ': ' + str(assign_val)}")
-        xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        # print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        # print(df.head(15))
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id', 'local_authority', f'{prefix}_duty_ended',
-                        'secured_accommodation', 'after_56days_deadline', 'contact_lost',
-                        'applicant_withdrew_or_deceased', 'rejected_final_accommodation_offered',
-                        'intentionally_homeless_from_accommodation_provided', 'accepted_by_another_la',
-                        'no_longer_eligible', 'uncooperative_and_served_notice', 'not_known']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      f"Total number of households where {prefix} duty ended1,2": f"{prefix}_duty_ended",
-                      "Secured accommodation for 6+ months": "secured_accommodation",
-                      "56 days elapsed": "after_56days_deadline",
-                      "Contact lost": "contact_lost",
-                      "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
-                      "Refused final accommodation": "rejected_final_accommodation_offered",
-                      "Intentionally homeless from accommodation provided": "intentionally_homeless_from_accommodation_provided",
-                      "Local connection referral accepted by other LA": "accepted_by_another_la",
-                      "No longer eligible": "no_longer_eligible",
-                      "Notice served due to refusal to cooperate": "uncooperative_and_served_notice",
-                      "Not known": "not_known"}
-        # print(list(col_mapper.values()))
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # sel_cols = [col_list[i] for i in range(len(col_list)) if "Unnamed:" not in col_list[i]]
-        # print(sel_cols)
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
+        # skip header rows above the ENGLAND total
         start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        # print(added_quarter_indicator.info())
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = [f'{prefix}_duty_ended',
-                    'secured_accommodation', 'after_56days_deadline', 'contact_lost',
-                    'applicant_withdrew_or_deceased', 'rejected_final_accommodation_offered',
-                    'intentionally_homeless_from_accommodation_provided', 'accepted_by_another_la',
-                    'no_longer_eligible', 'uncooperative_and_served_notice', 'not_known']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = [f'{prefix}_duty_ended',
-                    'secured_accommodation', 'after_56days_deadline', 'contact_lost',
-                    'applicant_withdrew_or_deceased', 'rejected_final_accommodation_offered',
-                    'intentionally_homeless_from_accommodation_provided', 'accepted_by_another_la',
-                    'no_longer_eligible', 'uncooperative_and_served_notice', 'not_known']
-        # fltg_cols = ['total_households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols)  # , flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
-        return df
+        df = df.iloc[start_index[0]:].reset_index(drop=True)
 
-    @staticmethod
-    def clean_tab_ta1(abs_file_path: str, sheet_name='A1', skiprows=1, assign_col='quarter_ending', assign_val=202406):
+        # filter out all records where system_id is blank, then rows containing mostly blank records
+        df = df.loc[df["system_id"].notna()].reset_index(drop=True)
+        df = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
 
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper() + ': ' + str(assign_val)}")
-        xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        # print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        # print(df.head(15))
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id', 'local_authority', 'households_in_ta',
-                        'ta_households_with_children', 'children_headcount_in_ta',
-                        'bnb_ta_households', 'bnb_ta_with_children',
-                        'bnb_ta_with_children_exceeding_6wks',
-                        'bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal',
-                        'bnb_ta_with_16yo_17yo_main_applicant', 'nightly_paid_ta_households',
-                        'nightly_paid_ta_with_children', 'hostel_ta_households',
-                        'hostel_ta_with_children', 'private_sector_ta',
-                        'private_sector_ta_with_children', 'la_ha_owned_managed_ta_households',
-                        'la_ha_owned_managed_ta_with_children', 'any_other_type_ta',
-                        'any_other_type_ta_with_children', 'in_another_la_ta',
-                        'no_secured_accommodation_ta', 'no_secured_accommodation_ta_with_children']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      f"Households in temporary accommodation at end of quarter1": "households_in_ta",
-                      f"Households in temporary accommodation at end of quarter1 children": "ta_households_with_children",
-                      "Unnamed: 8": "children_headcount_in_ta",
-                      "Bed and breakfast hotels (including shared annexes)": "bnb_ta_households",
-                      "Bed and breakfast hotels (including shared annexes) children": "bnb_ta_with_children",
-                      "Unnamed: 12": "bnb_ta_with_children_exceeding_6wks",
-                      "Unnamed: 13": "bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal",
-                      "Unnamed: 14": "bnb_ta_with_16yo_17yo_main_applicant",
-                      "Nightly paid, privately managed accommodation, self-contained": "nightly_paid_ta_households",
-                      "Nightly paid, privately managed accommodation, self-contained children": "nightly_paid_ta_with_children",
-                      "Hostels (including reception centres, emergency units and refuges)": "hostel_ta_households",
-                      "Hostels (including reception centres, emergency units and refuges) children": "hostel_ta_with_children",
-                      "Private sector accommodation leased by authority or by a registered provider": "private_sector_ta",
-                      "Private sector accommodation leased by authority or by a registered provider children": "private_sector_ta_with_children",
-                      "Local authority or Housing association (LA/HA) stock": "la_ha_owned_managed_ta_households",
-                      "Local authority or Housing association (LA/HA) stock children": "la_ha_owned_managed_ta_with_children",
-                      "Any other type of temporary accommodation (including private landlord and not known)2": "any_other_type_ta",
-                      "Any other type of temporary accommodation (including private landlord and not known)2 children": "any_other_type_ta_with_children",
-                      "In TA in another local authority district": "in_another_la_ta",
-                      "Duty owed, no accommodation secured3": "no_secured_accommodation_ta",
-                      "Duty owed, no accommodation secured3 children": "no_secured_accommodation_ta_with_children"}
-        # print(list(col_mapper.values()))
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # sel_cols = [col_list[i] for i in range(len(col_list)) if "Unnamed:" not in col_list[i]]
-        # print(sel_cols)
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
-        start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        # print(added_quarter_indicator.info())
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = ['households_in_ta',
-                    'ta_households_with_children', 'children_headcount_in_ta',
-                    'bnb_ta_households', 'bnb_ta_with_children',
-                    'bnb_ta_with_children_exceeding_6wks',
-                    'bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal',
-                    'bnb_ta_with_16yo_17yo_main_applicant', 'nightly_paid_ta_households',
-                    'nightly_paid_ta_with_children', 'hostel_ta_households',
-                    'hostel_ta_with_children', 'private_sector_ta',
-                    'private_sector_ta_with_children', 'la_ha_owned_managed_ta_households',
-                    'la_ha_owned_managed_ta_with_children', 'any_other_type_ta',
-                    'any_other_type_ta_with_children', 'in_another_la_ta',
-                    'no_secured_accommodation_ta', 'no_secured_accommodation_ta_with_children']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = ['households_in_ta',
-                    'ta_households_with_children', 'children_headcount_in_ta',
-                    'bnb_ta_households', 'bnb_ta_with_children',
-                    'bnb_ta_with_children_exceeding_6wks',
-                    'bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal',
-                    'bnb_ta_with_16yo_17yo_main_applicant', 'nightly_paid_ta_households',
-                    'nightly_paid_ta_with_children', 'hostel_ta_households',
-                    'hostel_ta_with_children', 'private_sector_ta',
-                    'private_sector_ta_with_children', 'la_ha_owned_managed_ta_households',
-                    'la_ha_owned_managed_ta_with_children', 'any_other_type_ta',
-                    'any_other_type_ta_with_children', 'in_another_la_ta',
-                    'no_secured_accommodation_ta', 'no_secured_accommodation_ta_with_children']
-        # fltg_cols = ['total_households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols)  # , flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
-        return df
+        # engineer quarter indicator feature
+        df = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
 
-    @staticmethod
-    def clean_tab_ta2(abs_file_path: str, sheet_name='A1', skiprows=1, assign_col='quarter_ending', assign_val=202406):
+        # engineer the local authority group indicators (e.g. is_neighbouring_la)
+        df = ProjUtil.flag_la_groups(df, la_groups=la_groups, categorical_la=categorical_la)
 
-        print(f"\nNOW CLEANING:\n {sheet_name} {assign_col.upper() + ': ' + str(assign_val)}")
-        xl_df = ProjUtil.pull_file_xl(file_path=abs_file_path, sheet_name=sheet_name, skiprows=skiprows)
-        # print(xl_df.info())
-        df = copy.deepcopy(xl_df)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=1)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        dropped_null_cols = ProjUtil.drop_empty_axis(df, valid_row_indicator=20)
-        print(dropped_null_cols.info())
-        df = copy.deepcopy(dropped_null_cols)
-        print(df.head(15))
-        # col_list = list(df.columns)
-        # print(col_list)
-        sel_colnames = ['system_id',
-                        'local_authority',
-                        'households_in_ta',
-                        'couple_with_children_ta',
-                        'single_father_with_children_ta',
-                        'single_mother_with_children_ta',
-                        'single_parent_of_other_unknown_gender_with_children_ta',
-                        'single_man_ta',
-                        'single_woman_ta',
-                        'single_other_gender_ta',
-                        'all_other_household_types_ta']
-        col_mapper = {"Unnamed: 0": "system_id",
-                      "Unnamed: 1": "local_authority",
-                      "Unnamed: 4":"households_in_ta",
-                      "Couple with dependent children": "couple_with_children_ta",
-                      "Single parent with dependent children  -  Male": "single_father_with_children_ta",
-                      "Single parent with dependent children  -  Female": "single_mother_with_children_ta",
-                      "Single parent with dependent children  -  Other/gender not known": "single_parent_of_other_unknown_gender_with_children_ta",
-                      "Single adult  -  Male": "single_man_ta",
-                      "Single adult  -  Female": "single_woman_ta",
-                      "Single adult  -  Other/gender not known": "single_other_gender_ta",
-                      "All other household types4": "all_other_household_types_ta"}
-        # print(list(col_mapper.values()))
-        assigned_col_mapper = df.rename(columns=col_mapper)
-        # print(assigned_col_mapper.head(10))
-        df = copy.deepcopy(assigned_col_mapper)
-
-        no_duplicates = df.drop_duplicates()
-        # print(no_duplicates.info())
-        df = copy.deepcopy(no_duplicates)
-
-        # col_list = list(df.columns)
-        # print(col_list)
-
-        # sel_cols = [col_list[i] for i in range(len(col_list)) if "Unnamed:" not in col_list[i]]
-        # print(sel_cols)
-        select_relevant_columns = df[sel_colnames]
-        # print(select_relevant_columns.info())
-        df = copy.deepcopy(select_relevant_columns)
-        start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
-        skip_header_rows = df.iloc[start_index[0]:].reset_index(drop=True)
-        # print(skip_header_rows.info())
-        df = copy.deepcopy(skip_header_rows)
-
-        cond = df["system_id"].notna()
-        dropped_null_sys_id = df.loc[cond].reset_index(drop=True)
-        # print(dropped_null_sys_id.info())
-        df = copy.deepcopy(dropped_null_sys_id)
-
-        dropped_null_rows = ProjUtil.drop_empty_axis(df, axis='rows', valid_row_indicator=3)
-        # print(dropped_null_rows.info())
-        df = copy.deepcopy(dropped_null_rows)
-
-        added_quarter_indicator = ProjUtil.add_constant_col(df=df, new_colname=assign_col, const_val=assign_val)
-        # print(added_quarter_indicator.info())
-
-        df = copy.deepcopy(added_quarter_indicator)
-        # print(df.head(10))
-
-        # engineer neighbouring local authority indicator
-        neighbouring_la_list = ['Southwark', 'Islington',
-                                'Haringey', 'Lambeth',
-                                'Tower Hamlets', 'Camden',
-                                'Waltham Forest', 'Hammersmith & Fulham',
-                                'Newham']
-        added_neighbouring_la_indicator = df['local_authority'].apply(lambda x: 1 if x in neighbouring_la_list else 0)
-        df['is_neighbouring_la'] = added_neighbouring_la_indicator
-        # print(added_neighbouring_la_indicator)
-
-        # replace system placeholder for missing values ".." with a more intuitive one - ""
-        col_list = ['households_in_ta',
-                    'couple_with_children_ta',
-                    'single_father_with_children_ta',
-                    'single_mother_with_children_ta',
-                    'single_parent_of_other_unknown_gender_with_children_ta',
-                    'single_man_ta',
-                    'single_woman_ta',
-                    'single_other_gender_ta',
-                    'all_other_household_types_ta']
-        for i in range(len(col_list)):
-            replace_null_placeholder = df[col_list[i]].astype("str").str.replace("..", "")
-            df[col_list[i]] = copy.deepcopy(replace_null_placeholder)
-            print(col_list[i])
-        print(df.loc[df['local_authority'] == "Camden"])
-
-        # recast column datatypes
-        intg_cols = ['households_in_ta',
-                    'couple_with_children_ta',
-                    'single_father_with_children_ta',
-                    'single_mother_with_children_ta',
-                    'single_parent_of_other_unknown_gender_with_children_ta',
-                    'single_man_ta',
-                    'single_woman_ta',
-                    'single_other_gender_ta',
-                    'all_other_household_types_ta']
-        # fltg_cols = ['total_households_in_area_000s']
-        print(df[intg_cols].head(5))
-        changed_data_types = ProjUtil.recast_dtypes(df, int_cols=intg_cols)  # , flt_cols=fltg_cols)
-        print(changed_data_types.info())
-        df = copy.deepcopy(changed_data_types)
-
-        print("\nCLEANING COMPLETE!")
-        return df
\ No newline at end of file
+        # turn the DLUHC missing value markers ("..", "x", "-", "[c]") into NA and recast the metric columns
+        df = ProjUtil.coerce_numeric_block(df, int_cols=sheet_spec['int_cols'], flt_cols=sheet_spec['flt_cols'])
+
+        logger.debug("CLEANING COMPLETE!")
+        return df
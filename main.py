@@ -1,3 +1,5 @@
+import argparse
+from functools import partial
 import tab_A1_etl as process_initial_assessment
 import tab_A2P_etl as process_owed_prevention_duty
 import tab_A2R_etl as process_owed_relief_duty
@@ -5,24 +7,84 @@ import tab_P1_etl as process_prevention_duty_ended
 import tab_R1_etl as process_relief_duty_ended
 import tab_TA1_etl as process_temp_accommodation
 import tab_TA2_etl as process_temp_accommodation_households_composition
+from helper_utils import ProjUtil as pjl
+from etl_settings import etl_var as evr
 
-def app():
+# tab pipelines keyed by the name used in their task labels
+tab_pipelines = {'a1': process_initial_assessment,
+                 'a2p': process_owed_prevention_duty,
+                 'a2r': process_owed_relief_duty,
+                 'p1': process_prevention_duty_ended,
+                 'r1': process_relief_duty_ended,
+                 'ta1': process_temp_accommodation,
+                 'ta2': process_temp_accommodation_households_composition}
 
-    sample_filename = "Detailed_LA_202406_revised.xlsx"
-
-    process_initial_assessment.run_app(sample_filename)
+def app(use_sheet_cache: bool = evr['use_sheet_cache'], clear_sheet_cache=False,
+        workers: int = evr['clean_workers'], parallelism: int = evr['max_parallel_tasks'],
+        persist_table_metadata: bool = evr['persist_table_metadata'], refresh_table_metadata=False,
+        log_level: str = evr['log_level']):
 
-    process_owed_prevention_duty.run_app(sample_filename)
+    pjl.configure_logging(log_level)
+    sample_filename = "Detailed_LA_202406_revised.xlsx"
 
-    process_owed_relief_duty.run_app(sample_filename)
+    # keep parsed sheets on disk so that unchanged quarterly files are not parsed again
+    sep = '/'
+    src_fdr_path = sep.join([evr['root_dir'], evr['read_fdr']])
+    cache_dir = sep.join([src_fdr_path, evr['sheet_cache_fdr']])
+    if use_sheet_cache:
+        pjl.configure_sheet_cache(cache_dir=cache_dir,
+                                  max_mb=evr['sheet_cache_max_mb'],
+                                  clear_cache=clear_sheet_cache)
+    elif clear_sheet_cache:
+        pjl.clear_sheet_cache(cache_dir)
 
-    process_prevention_duty_ended.run_app(sample_filename)
+    # reuse table reflections from earlier runs; refresh them after changing the database schema
+    # (refreshing persists the new reflections, so it implies persist_table_metadata)
+    if persist_table_metadata or refresh_table_metadata:
+        pjl.configure_table_metadata_cache(cache_file=sep.join([evr['root_dir'], evr['table_metadata_file']]),
+                                           clear_cache=refresh_table_metadata)
 
-    process_relief_duty_ended.run_app(sample_filename)
+    # parse each quarterly workbook once and share its sheets across all tabs
+    pjl.enable_workbook_cache(sheet_names=['A1', 'A2P', 'A2R', 'P1', 'R1', 'TA1', 'TA2'])
+    file_paths = list(pjl.get_full_path(folder_path=src_fdr_path, specify_ftype=["xls", "ods"]).values())
 
-    process_temp_accommodation.run_app(sample_filename)
+    # shared source parse -> per-tab clean -> load -> materialized view refresh -> csv export
+    etl_tasks = {'parse': (partial(pjl.prime_workbook_cache, file_paths, skiprows=1, workers=workers), [])}
+    for tab, pipeline in tab_pipelines.items():
+        # cleaning reads from the primed workbook cache, so it needs no worker processes of its own
+        etl_ctx = {'sample_filename': sample_filename, 'workers': None}
+        etl_tasks[f'clean:{tab}'] = (partial(pipeline.clean_stage, etl_ctx), ['parse'])
+        etl_tasks[f'load:{tab}'] = (partial(pipeline.load_stage, etl_ctx), [f'clean:{tab}'])
+        etl_tasks[f'refresh:{tab}'] = (partial(pipeline.refresh_stage, etl_ctx), [f'load:{tab}'])
+        etl_tasks[f'export:{tab}'] = (partial(pipeline.export_stage, etl_ctx), [f'refresh:{tab}'])
 
-    process_temp_accommodation_households_composition.run_app(sample_filename)
+    try:
+        pjl.run_task_graph(etl_tasks, max_workers=parallelism)
+    finally:
+        pjl.clear_workbook_cache()
+        pjl.disable_sheet_cache()
+        pjl.disable_table_metadata_cache()
+        pjl.dispose_shared_engines()
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Refresh Hackney homelessness staging tables and summaries")
+    parser.add_argument('--no-sheet-cache', action='store_true',
+                        help="parse every source file without reading or writing the on-disk sheet cache")
+    parser.add_argument('--clear-sheet-cache', action='store_true',
+                        help="remove all cached sheets before running")
+    parser.add_argument('--workers', type=int, default=evr['clean_workers'],
+                        help="number of processes parsing quarterly files in parallel")
+    parser.add_argument('--parallelism', type=int, default=evr['max_parallel_tasks'],
+                        help="number of pipeline tasks (clean, load, refresh, export) running at once")
+    parser.add_argument('--persist-table-metadata', action='store_true', default=evr['persist_table_metadata'],
+                        help="keep reflected database tables on disk and reuse them in later runs")
+    parser.add_argument('--refresh-table-metadata', action='store_true',
+                        help="reflect database tables again instead of reusing the persisted metadata "
+                             "(implies --persist-table-metadata)")
+    parser.add_argument('--log-level', default=evr['log_level'],
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="lowest level of the messages logged; DEBUG adds dataframe summaries")
+    args = parser.parse_args()
+    app(use_sheet_cache=not args.no_sheet_cache, clear_sheet_cache=args.clear_sheet_cache,
+        workers=args.workers, parallelism=args.parallelism, persist_table_metadata=args.persist_table_metadata,
+        refresh_table_metadata=args.refresh_table_metadata, log_level=args.log_level)
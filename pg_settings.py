@@ -3,5 +3,9 @@ pg_var = {
     'db_pwd':"osagie25al",
     'db_host':"localhost",
     'db_port':"5432",
-    'db_name':"HackneyInterview"
+    'db_name':"HackneyInterview",
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800
 }
\ No newline at end of file
@@ -11,8 +11,31 @@ CREATE TABLE staging.tab_a1 (
 	relief_duty_owed INTEGER,
 	households_in_area_000s NUMERIC,
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(initial_assessments::text, '') || '|' ||
+		coalesce(owed_prevention_or_relief_duty::text, '') || '|' ||
+		coalesce(prevention_duty_owed::text, '') || '|' ||
+		coalesce(relief_duty_owed::text, '') || '|' ||
+		coalesce(households_in_area_000s::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_a1_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_a1_default PARTITION OF staging.tab_a1 DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_a1_fingerprint_idx ON staging.tab_a1 (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_a1_neighbour_qtr_idx ON staging.tab_a1 (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_a1_hackney_qtr_idx ON staging.tab_a1 (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_a2p (
 	system_id varchar(20) NOT NULL,
@@ -32,8 +55,40 @@ CREATE TABLE staging.tab_a2p (
 	loss_of_placement_or_sponsorship INTEGER,
 	for_other_or_unknown_reasons INTEGER,
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(prevention_duty_owed::text, '') || '|' ||
+		coalesce(family_or_friend_terminations::text, '') || '|' ||
+		coalesce(ast_private_rented_terminations::text, '') || '|' ||
+		coalesce(domestic_abuse_terminations::text, '') || '|' ||
+		coalesce(non_violent_relationship_breakdown_terminations::text, '') || '|' ||
+		coalesce(social_rented_tenancy_terminations::text, '') || '|' ||
+		coalesce(supported_housing_terminations::text, '') || '|' ||
+		coalesce(non_ast_private_rented_terminations::text, '') || '|' ||
+		coalesce(other_violence_or_harassment_terminations::text, '') || '|' ||
+		coalesce(institution_departures::text, '') || '|' ||
+		coalesce(home_office_asylum_support_terminations::text, '') || '|' ||
+		coalesce(new_home_for_illness_or_disability::text, '') || '|' ||
+		coalesce(loss_of_placement_or_sponsorship::text, '') || '|' ||
+		coalesce(for_other_or_unknown_reasons::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_a2p_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_a2p_default PARTITION OF staging.tab_a2p DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_a2p_fingerprint_idx ON staging.tab_a2p (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_a2p_neighbour_qtr_idx ON staging.tab_a2p (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_a2p_hackney_qtr_idx ON staging.tab_a2p (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_a2r (
 	system_id varchar(20) NOT NULL,
@@ -53,8 +108,40 @@ CREATE TABLE staging.tab_a2r (
 	loss_of_placement_or_sponsorship INTEGER,
 	for_other_or_unknown_reasons INTEGER,
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(relief_duty_owed::text, '') || '|' ||
+		coalesce(family_or_friend_terminations::text, '') || '|' ||
+		coalesce(ast_private_rented_terminations::text, '') || '|' ||
+		coalesce(domestic_abuse_terminations::text, '') || '|' ||
+		coalesce(non_violent_relationship_breakdown_terminations::text, '') || '|' ||
+		coalesce(social_rented_tenancy_terminations::text, '') || '|' ||
+		coalesce(supported_housing_terminations::text, '') || '|' ||
+		coalesce(non_ast_private_rented_terminations::text, '') || '|' ||
+		coalesce(other_violence_or_harassment_terminations::text, '') || '|' ||
+		coalesce(institution_departures::text, '') || '|' ||
+		coalesce(home_office_asylum_support_terminations::text, '') || '|' ||
+		coalesce(new_home_for_illness_or_disability::text, '') || '|' ||
+		coalesce(loss_of_placement_or_sponsorship::text, '') || '|' ||
+		coalesce(for_other_or_unknown_reasons::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_a2r_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_a2r_default PARTITION OF staging.tab_a2r DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_a2r_fingerprint_idx ON staging.tab_a2r (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_a2r_neighbour_qtr_idx ON staging.tab_a2r (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_a2r_hackney_qtr_idx ON staging.tab_a2r (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_p1 (
 	system_id varchar(20) NOT NULL, 
@@ -70,8 +157,36 @@ CREATE TABLE staging.tab_p1 (
 	uncooperative INTEGER, 
 	not_known INTEGER, 
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(prevention_duty_ended::text, '') || '|' ||
+		coalesce(secured_accommodation::text, '') || '|' ||
+		coalesce(homelessness::text, '') || '|' ||
+		coalesce(contact_lost::text, '') || '|' ||
+		coalesce(no_further_action_after_56days::text, '') || '|' ||
+		coalesce(applicant_withdrew_or_deceased::text, '') || '|' ||
+		coalesce(no_longer_eligible::text, '') || '|' ||
+		coalesce(rejected_offered_accommodation::text, '') || '|' ||
+		coalesce(uncooperative::text, '') || '|' ||
+		coalesce(not_known::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_p1_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_p1_default PARTITION OF staging.tab_p1 DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_p1_fingerprint_idx ON staging.tab_p1 (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_p1_neighbour_qtr_idx ON staging.tab_p1 (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_p1_hackney_qtr_idx ON staging.tab_p1 (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_r1 (
 	system_id varchar(20) NOT NULL, 
@@ -88,8 +203,37 @@ CREATE TABLE staging.tab_r1 (
 	uncooperative_and_served_notice INTEGER, 
 	not_known INTEGER, 
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(relief_duty_ended::text, '') || '|' ||
+		coalesce(secured_accommodation::text, '') || '|' ||
+		coalesce(after_56days_deadline::text, '') || '|' ||
+		coalesce(contact_lost::text, '') || '|' ||
+		coalesce(applicant_withdrew_or_deceased::text, '') || '|' ||
+		coalesce(rejected_final_accommodation_offered::text, '') || '|' ||
+		coalesce(intentionally_homeless_from_accommodation_provided::text, '') || '|' ||
+		coalesce(accepted_by_another_la::text, '') || '|' ||
+		coalesce(no_longer_eligible::text, '') || '|' ||
+		coalesce(uncooperative_and_served_notice::text, '') || '|' ||
+		coalesce(not_known::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_r1_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_r1_default PARTITION OF staging.tab_r1 DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_r1_fingerprint_idx ON staging.tab_r1 (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_r1_neighbour_qtr_idx ON staging.tab_r1 (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_r1_hackney_qtr_idx ON staging.tab_r1 (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_ta1 (
 	system_id varchar(20) NOT NULL, 
@@ -116,8 +260,47 @@ CREATE TABLE staging.tab_ta1 (
 	no_secured_accommodation_ta INTEGER, 
 	no_secured_accommodation_ta_with_children INTEGER, 
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(households_in_ta::text, '') || '|' ||
+		coalesce(ta_households_with_children::text, '') || '|' ||
+		coalesce(children_headcount_in_ta::text, '') || '|' ||
+		coalesce(bnb_ta_households::text, '') || '|' ||
+		coalesce(bnb_ta_with_children::text, '') || '|' ||
+		coalesce(bnb_ta_with_children_exceeding_6wks::text, '') || '|' ||
+		coalesce(bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal::text, '') || '|' ||
+		coalesce(bnb_ta_with_16yo_17yo_main_applicant::text, '') || '|' ||
+		coalesce(nightly_paid_ta_households::text, '') || '|' ||
+		coalesce(nightly_paid_ta_with_children::text, '') || '|' ||
+		coalesce(hostel_ta_households::text, '') || '|' ||
+		coalesce(hostel_ta_with_children::text, '') || '|' ||
+		coalesce(private_sector_ta::text, '') || '|' ||
+		coalesce(private_sector_ta_with_children::text, '') || '|' ||
+		coalesce(la_ha_owned_managed_ta_households::text, '') || '|' ||
+		coalesce(la_ha_owned_managed_ta_with_children::text, '') || '|' ||
+		coalesce(any_other_type_ta::text, '') || '|' ||
+		coalesce(any_other_type_ta_with_children::text, '') || '|' ||
+		coalesce(in_another_la_ta::text, '') || '|' ||
+		coalesce(no_secured_accommodation_ta::text, '') || '|' ||
+		coalesce(no_secured_accommodation_ta_with_children::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_ta1_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_ta1_default PARTITION OF staging.tab_ta1 DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_ta1_fingerprint_idx ON staging.tab_ta1 (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_ta1_neighbour_qtr_idx ON staging.tab_ta1 (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_ta1_hackney_qtr_idx ON staging.tab_ta1 (quarter_ending) WHERE local_authority = 'Hackney';
 
 CREATE TABLE staging.tab_ta2 (
 	system_id varchar(20) NOT NULL, 
@@ -132,5 +315,32 @@ CREATE TABLE staging.tab_ta2 (
 	single_other_gender_ta INTEGER,
 	all_other_household_types_ta INTEGER,
 	quarter_ending INTEGER,
-	is_neighbouring_la INTEGER
-);
\ No newline at end of file
+	is_neighbouring_la INTEGER,
+	-- md5 of the row's values, kept up to date by postgres for the loader's delta and upsert
+	row_fingerprint char(32) GENERATED ALWAYS AS (md5(
+		system_id || '|' ||
+		local_authority || '|' ||
+		coalesce(households_in_ta::text, '') || '|' ||
+		coalesce(couple_with_children_ta::text, '') || '|' ||
+		coalesce(single_father_with_children_ta::text, '') || '|' ||
+		coalesce(single_mother_with_children_ta::text, '') || '|' ||
+		coalesce(single_parent_of_other_unknown_gender_with_children_ta::text, '') || '|' ||
+		coalesce(single_man_ta::text, '') || '|' ||
+		coalesce(single_woman_ta::text, '') || '|' ||
+		coalesce(single_other_gender_ta::text, '') || '|' ||
+		coalesce(all_other_household_types_ta::text, '') || '|' ||
+		coalesce(quarter_ending::text, '') || '|' ||
+		coalesce(is_neighbouring_la::text, '')
+	)) STORED,
+	CONSTRAINT tab_ta2_pkey PRIMARY KEY (system_id, quarter_ending)
+) PARTITION BY LIST (quarter_ending);
+
+-- one partition per quarter is created by the loader's partition swap, other rows land here
+-- until the next swap moves them to partitions of their own
+CREATE TABLE staging.tab_ta2_default PARTITION OF staging.tab_ta2 DEFAULT;
+
+-- delta lookups of the loader
+CREATE INDEX tab_ta2_fingerprint_idx ON staging.tab_ta2 (row_fingerprint);
+-- the two series the core views aggregate per quarter
+CREATE INDEX tab_ta2_neighbour_qtr_idx ON staging.tab_ta2 (quarter_ending) WHERE is_neighbouring_la = 1;
+CREATE INDEX tab_ta2_hackney_qtr_idx ON staging.tab_ta2 (quarter_ending) WHERE local_authority = 'Hackney';
@@ -1,22 +1,28 @@
 import copy
+import logging
 import numpy as np
 import pandas as pd
-from helper_utils import ProjUtil as pjl
+from helper_utils import ProjUtil as pjl, FrameSummary
 from pg_settings import pg_var as pvr
+from etl_settings import etl_var as evr
 from sqlalchemy import text
 
+logger = logging.getLogger(__name__)
+
 # configure display settings
 pd.options.display.width = None
 pd.options.display.max_columns = None
 pd.set_option('display.max_rows', 1000)
 pd.set_option('display.max_columns', 300)
 
-def run_app(sample_filename: str="Detailed_LA_202503.ods"):
+def clean_stage(etl_ctx: dict):
+    """extract and clean every quarterly source file into etl_ctx['final_df']"""
+
     # load sample dataset
     # root_dir = "https://godsvisionenterprise24-my.sharepoint.com/personal/o_aibangbee_godsvisionenterprise24_onmicrosoft_com/Documents/Documents/Workspace/IT Career/Cedarstone"
-    root_dir = "/Users/osagieaib/Library/CloudStorage/OneDrive-GodsVisionEnterprise/Documents/Interview/Hackney Council"
-    read_fdr = "SourceData"
-    sample_fname = sample_filename
+    root_dir = evr['root_dir']
+    read_fdr = evr['read_fdr']
+    sample_fname = etl_ctx['sample_filename']
     sep = '/'
     file_path = sep.join([root_dir, read_fdr, sample_fname])
     shname = 'A2P'
@@ -27,11 +33,14 @@ def run_app(sample_filename: str="Detailed_LA_202503.ods"):
     qtr_val = pjl.get_qtr_from_fname(file_path)
     # extract and clean data from most recent quarterly file
     # and use as model structure
-    sample_qdf = pjl.clean_tab_a2(abs_file_path=file_path,
-                                  sheet_name=shname,
-                                  assign_col=col_name,
-                                  assign_val=qtr_val,
-                                  prefix=pref_val)
+    sample_qdf = pjl.clean_tab(abs_file_path=file_path,
+                               use_func='a2',
+                               sheet_name=shname,
+                               assign_col=col_name,
+                               assign_val=qtr_val,
+                               prefix=pref_val,
+                               la_groups=evr['la_groups'],
+                               categorical_la=evr['categorical_local_authority'])
     # print(sample_qdf.info())
     # print(sample_qdf.head(15))
 
@@ -50,103 +59,178 @@ def run_app(sample_filename: str="Detailed_LA_202503.ods"):
                                          assign_colname=col_name,
                                          sheet_name=shname,
                                          prefix=pref_val,
-                                         use_func='a2').sort_values(by="quarter_ending")
+                                         use_func='a2',
+                                         workers=etl_ctx['workers'],
+                                         la_groups=evr['la_groups'],
+                                         categorical_la=evr['categorical_local_authority']).sort_values(by="quarter_ending", kind='stable')
 
-    print(all_qtr_df.info())
-    print(all_qtr_df['quarter_ending'].value_counts())
+    logger.debug('%s', FrameSummary(all_qtr_df))
+    logger.debug('%s', FrameSummary(all_qtr_df['quarter_ending'], 'value_counts'))
 
     df = copy.deepcopy(all_qtr_df)
-    print(df.head())
+    # flags of local authority groups without a staging column are not loaded
+    df = df.drop(columns=[col for col in evr['la_groups'] if col not in evr['staged_la_groups']])
+    logger.debug('%s', FrameSummary(df, 'head'))
 
     # engineer a combo variable for delta columns (ie unique row identifiers)
     col_order = list(df.columns)
     delta_id = 'delta_id'
-    df = pjl.concat_column_values(df, column_names=col_order, delta_id=delta_id)
+    df = pjl.concat_column_values(df, column_names=col_order, delta_id=delta_id,
+                                  use_hash=evr['hash_delta_id'])
     final_df = copy.deepcopy(df)
-    print(final_df.info())
-
-    # create instance of database session for the database
-    db_user = pvr['db_user']
-    db_pwd = pvr['db_pwd']
-    db_name = pvr['db_name']
-    db_host = pvr['db_host']
-    db_port = pvr['db_port']
-    dbase_cred = pjl.dbase_conn_sqlalchemy(dbase_name=db_name, dbase_password=db_pwd, dbase_port=db_port)
-    dbase_engine = dbase_cred['engine']
-    dbase_conn = dbase_cred['connection']
+    logger.debug('%s', FrameSummary(final_df))
 
-    # get data from database table
-    db_table_name = 'tab_a2p'
-    db_schema = 'staging'
-    db_table = pjl.sqlalchem_select_query(table_name=db_table_name, schema_name=db_schema, dbase_engine=dbase_engine, dbase_conn=dbase_conn)
+    etl_ctx.update(root_dir=root_dir, sep=sep, all_qtr_df=all_qtr_df, final_df=final_df,
+                   col_order=col_order, delta_id=delta_id, pref_val=pref_val)
 
-    intg_cols = [f'{pref_val}_duty_owed', 'family_or_friend_terminations',
-                'ast_private_rented_terminations',
-                'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
-                'social_rented_tenancy_terminations',
-                'supported_housing_terminations', 'non_ast_private_rented_terminations',
-                'other_violence_or_harassment_terminations',
-                'institution_departures', 'home_office_asylum_support_terminations',
-                'new_home_for_illness_or_disability',
-                'loss_of_placement_or_sponsorship', 'for_other_or_unknown_reasons']
-    # fltg_cols = ['total_households_in_area_000s']
 
-    # replace Python NoneType with pandas NaN
-    db_table = db_table.fillna(value=np.nan)
+def load_stage(etl_ctx: dict):
+    """load the fresh records in etl_ctx['final_df'] into the staging table"""
 
-    db_table = pjl.recast_dtypes(db_table, int_cols=intg_cols)#, flt_cols=fltg_cols)
-    print(db_table.info())
+    root_dir, sep = etl_ctx['root_dir'], etl_ctx['sep']
+    final_df, col_order, delta_id = etl_ctx['final_df'], etl_ctx['col_order'], etl_ctx['delta_id']
+    pref_val = etl_ctx['pref_val']
 
-    # engineer a combo variable for delta columns (ie unique row identifiers)
-    db_table = pjl.concat_column_values(db_table, column_names=col_order, delta_id=delta_id)
-    print(db_table.info())
-
-    # load into target database table
-    print('\nLOADING FRESH RECORDS INTO TARGET')
-    delta_load = pjl.run_delta_load_to_db(new_data=final_df, old_data=db_table, delta_col_name=delta_id, database_table_name=db_table_name, db_engine=dbase_engine, db_schema=db_schema)
+    # borrow a connection from the shared database engine
+    dbase_cred = pjl.dbase_conn_from_settings(pvr)
+    dbase_engine = dbase_cred['engine']
+    dbase_conn = dbase_cred['connection']
 
-    # delete old record from database
-    print('\nCHECKING FOR REDUNDANT RECORD IN THE DATABASE')
-    db_rec_del = pjl.run_delta_load_to_db(new_data=db_table, old_data=final_df, delta_col_name=delta_id, database_table_name=db_table_name, db_engine=dbase_engine, db_schema=db_schema, load_to_db=False)
-    print(f'\nDelete {db_rec_del.shape[0]} old record form database')
-    print(db_rec_del)
+    db_table_name = 'tab_a2p'
+    db_schema = 'staging'
+    key_cols = evr['staging_key_cols']
+    if key_cols:
+        # the staging table holds one row per natural key, keep the first one read for each
+        final_df = pjl.dedupe_on_key(final_df, key_cols)
+    # quarters found in SourceData; staging rows of other quarters are left untouched
+    reload_qtrs = final_df['quarter_ending'].drop_duplicates().tolist()
+    if evr['partition_swap_load'] and (evr['delta_mode'] == 'database' or evr['sync_obsolete_rows']):
+        logger.warning('partition_swap_load only applies to the python delta mode without sync_obsolete_rows, '
+                       'loading %s without swapping partitions', db_table_name)
+    if evr['delta_mode'] == 'database':
+        # diff fresh records against the target table inside the database
+        logger.info('LOADING FRESH RECORDS INTO TARGET')
+        delta_res = pjl.run_db_delta_load(new_data=final_df[col_order], database_table_name=db_table_name,
+                                          db_engine=dbase_engine, db_schema=db_schema,
+                                          load_method=evr['load_method'],
+                                          delete_obsolete=evr['sync_obsolete_rows'],
+                                          scope_cols=['quarter_ending'], key_cols=key_cols)
+        delta_load = delta_res['delta_load']
+        logger.info('%d redundant records found in the database', delta_res['obsolete'])
+    else:
+        # get data from database table, only for the quarters being reloaded
+        db_table = pjl.sqlalchem_select_query(table_name=db_table_name, schema_name=db_schema, dbase_engine=dbase_engine, dbase_conn=dbase_conn, columns=col_order, isin={'quarter_ending': reload_qtrs})
+        # end the read transaction, a partition swap on another connection would otherwise wait on its lock
+        dbase_conn.commit()
+
+        intg_cols = [f'{pref_val}_duty_owed', 'family_or_friend_terminations',
+                    'ast_private_rented_terminations',
+                    'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
+                    'social_rented_tenancy_terminations',
+                    'supported_housing_terminations', 'non_ast_private_rented_terminations',
+                    'other_violence_or_harassment_terminations',
+                    'institution_departures', 'home_office_asylum_support_terminations',
+                    'new_home_for_illness_or_disability',
+                    'loss_of_placement_or_sponsorship', 'for_other_or_unknown_reasons']
+        # fltg_cols = ['total_households_in_area_000s']
+
+        # replace Python NoneType with pandas NaN
+        db_table = db_table.fillna(value=np.nan)
+
+        db_table = pjl.recast_dtypes(db_table, int_cols=intg_cols)#, flt_cols=fltg_cols)
+        logger.debug('%s', FrameSummary(db_table))
+
+        # engineer a combo variable for delta columns (ie unique row identifiers)
+        db_table = pjl.concat_column_values(db_table, column_names=col_order, delta_id=delta_id,
+                                            use_hash=evr['hash_delta_id'])
+        logger.debug('%s', FrameSummary(db_table))
+
+        # load into target database table
+        logger.info('LOADING FRESH RECORDS INTO TARGET')
+        delta_load = pjl.run_delta_load_to_db(new_data=final_df, old_data=db_table, delta_col_name=delta_id, database_table_name=db_table_name, db_engine=dbase_engine, db_schema=db_schema, load_method=evr['load_method'], load_to_db=not evr['sync_obsolete_rows'], key_cols=key_cols, swap_partitions=evr['partition_swap_load'])
+
+        # delete old record from database
+        logger.info('CHECKING FOR REDUNDANT RECORD IN THE DATABASE')
+        db_rec_del = pjl.run_delta_load_to_db(new_data=db_table, old_data=final_df, delta_col_name=delta_id, database_table_name=db_table_name, db_engine=dbase_engine, db_schema=db_schema, load_to_db=False)
+        logger.info('Delete %d old record from database', db_rec_del.shape[0])
+        logger.debug('%s', db_rec_del)
+
+        if evr['sync_obsolete_rows']:
+            # delete the redundant records and insert the fresh ones in one transaction
+            pjl.sync_delta_to_db(delta_load=delta_load, obsolete_rows=db_rec_del, database_table_name=db_table_name,
+                                 db_engine=dbase_engine, db_schema=db_schema, load_method=evr['load_method'],
+                                 key_cols=key_cols)
 
     # load to dataframe csv for export
-    read_fdr = "TransformedData"
+    read_fdr = evr['write_fdr']
     wfile_name = f'tab_a2p_cleaned.csv'
     wfile_path = sep.join([root_dir, read_fdr, wfile_name])
     # wfile_path = f'DBLoad\\property_registration_{date_tag}.csv'
     delta_load.to_csv(wfile_path, index=False, encoding='utf8')
 
+    # quarters whose staging rows changed, for the incremental summary refresh
+    touched_qtrs = set(delta_load['quarter_ending'].tolist())
+    if evr['sync_obsolete_rows']:
+        touched_qtrs.update(reload_qtrs)
+
+    etl_ctx.update(dbase_engine=dbase_engine, dbase_conn=dbase_conn, read_fdr=read_fdr,
+                   touched_qtrs=sorted(touched_qtrs))
+
+
+def refresh_stage(etl_ctx: dict):
+    """refresh the core summary built on the staging table, fully or only for the changed quarters"""
+
+    dbase_conn = etl_ctx['dbase_conn']
+
     # refresh materialized view
     refresh_schema = "core"
     refresh_view = "prevention_duty_summary"
-    pjl.refresh_pgsql_mview(db_conn=dbase_conn,
-                            refresh_schema=refresh_schema,
-                            refresh_mview_name=refresh_view)
+    if evr['summary_refresh_mode'] == 'incremental':
+        # recompute only the changed quarters of the summary table
+        pjl.refresh_summary_quarters(db_conn=dbase_conn, refresh_schema=refresh_schema,
+                                     refresh_summary_name=refresh_view, quarters=etl_ctx['touched_qtrs'])
+    else:
+        pjl.refresh_pgsql_mview(db_conn=dbase_conn,
+                                refresh_schema=refresh_schema,
+                                refresh_mview_name=refresh_view,
+                                concurrently=evr['concurrent_mview_refresh'])
 
-    # load transformed view onto dataframe for csv export
-    db_schema = 'public'
-    db_transformation_name = 'prevention_duty_summary'
-    df = pjl.sqlalchem_select_query(table_name=db_transformation_name,
-                                    schema_name=db_schema,
-                                    dbase_engine=dbase_engine,
-                                    dbase_conn=dbase_conn)
-    print(df.info())
 
-    final_df = copy.deepcopy(df)
+def export_stage(etl_ctx: dict):
+    """export the refreshed summary view to csv and close the database connection"""
 
-    # close engine
-    dbase_conn.close()
-    dbase_engine.dispose()
+    root_dir, sep, read_fdr = etl_ctx['root_dir'], etl_ctx['sep'], etl_ctx['read_fdr']
+    dbase_engine, dbase_conn = etl_ctx['dbase_engine'], etl_ctx['dbase_conn']
+    all_qtr_df = etl_ctx['all_qtr_df']
 
-    # export transformation to csv file
+    # stream the transformed view into the csv export one chunk at a time
+    db_schema = 'public'
+    db_transformation_name = 'prevention_duty_summary'
     wfile_name = f'prevention_duty_summary.csv'
     wfile_path = sep.join([root_dir, read_fdr, wfile_name])
     # wfile_path = f'DBLoad\\property_registration_{date_tag}.csv'
-    final_df.to_csv(wfile_path, index=False, encoding='utf8')
+    n_rows = pjl.export_select_query_csv(table_name=db_transformation_name,
+                                         schema_name=db_schema,
+                                         dbase_engine=dbase_engine,
+                                         dbase_conn=dbase_conn,
+                                         file_path=wfile_path,
+                                         chunk_rows=evr['read_chunk_rows'])
+    logger.info('%d rows exported to %s', n_rows, wfile_name)
+
+    # hand the connection back to the shared pool
+    dbase_conn.close()
+
+    logger.debug('%s', FrameSummary(all_qtr_df['quarter_ending'], 'value_counts'))
+    logger.info('finish')
+
 
-    print(all_qtr_df['quarter_ending'].value_counts())
-    print('finish')
+def run_app(sample_filename: str="Detailed_LA_202503.ods", workers: int = None):
+    pjl.configure_logging(evr['log_level'])
+    etl_ctx = {'sample_filename': sample_filename, 'workers': workers}
+    clean_stage(etl_ctx)
+    load_stage(etl_ctx)
+    refresh_stage(etl_ctx)
+    export_stage(etl_ctx)
+    pjl.dispose_shared_engines()
 
 # run_app()
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""clean_tab against the per-tab clean_tab_* functions it replaced, on a small synthetic sheet per tab"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper_utils import ProjUtil
+
+# column maps of the legacy clean_tab_a1, _a2, _p1, _r1, _ta1 and _ta2, in their staging column order
+# (a2, p1 and r1 take the duty type prefix), kept apart from sheet_specs so a drift in the spec shows up here
+LEGACY_COL_MAPPERS = {
+    'a1': lambda prefix: {"Unnamed: 0": "system_id",
+                          "Unnamed: 1": "local_authority",
+                          "Total number of households assessed1,2": "initial_assessments",
+                          "Total households assessed as owed a duty": "owed_prevention_or_relief_duty",
+                          "Threatened with homelessness - Prevention duty owed": "prevention_duty_owed",
+                          "Homeless - Relief duty owed": "relief_duty_owed",
+                          "Unnamed: 15": "households_in_area_000s"},
+    'a2': lambda prefix: {"Unnamed: 0": "system_id",
+                          "Unnamed: 1": "local_authority",
+                          "Unnamed: 4": f"{prefix}_duty_owed",
+                          "Family or friends no longer willing or able to accommodate": "family_or_friend_terminations",
+                          "End of private rented tenancy - assured shorthold": "ast_private_rented_terminations",
+                          "Domestic abuse": "domestic_abuse_terminations",
+                          "Non-violent relationship breakdown with partner": "non_violent_relationship_breakdown_terminations",
+                          "End of social rented tenancy": "social_rented_tenancy_terminations",
+                          "Eviction from supported housing": "supported_housing_terminations",
+                          "End of private rented tenancy - not assured shorthold": "non_ast_private_rented_terminations",
+                          "Other violence or harrassment": "other_violence_or_harassment_terminations",
+                          "Left institution with no accommodation available": "institution_departures",
+                          "Required to leave accommodation provided by Home Office as asylum support": "home_office_asylum_support_terminations",
+                          "Home no longer suitable - disability / ill health": "new_home_for_illness_or_disability",
+                          "Unnamed: 56": "loss_of_placement_or_sponsorship",
+                          "Other reasons / not known6": "for_other_or_unknown_reasons"},
+    'p1': lambda prefix: {"Unnamed: 0": "system_id",
+                          "Unnamed: 1": "local_authority",
+                          f"Total number of households where {prefix} duty ended1,2": f"{prefix}_duty_ended",
+                          "Secured accommodation for 6+ months": "secured_accommodation",
+                          "Homeless (including intentionally homeless)": "homelessness",
+                          "Contact lost": "contact_lost",
+                          "56 days elapsed and no further action": "no_further_action_after_56days",
+                          "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
+                          "No longer eligible": "no_longer_eligible",
+                          "Refused suitable accommodation offer": "rejected_offered_accommodation",
+                          "Refused to cooperate": "uncooperative",
+                          "Not known6": "not_known"},
+    'r1': lambda prefix: {"Unnamed: 0": "system_id",
+                          "Unnamed: 1": "local_authority",
+                          f"Total number of households where {prefix} duty ended1,2": f"{prefix}_duty_ended",
+                          "Secured accommodation for 6+ months": "secured_accommodation",
+                          "56 days elapsed": "after_56days_deadline",
+                          "Contact lost": "contact_lost",
+                          "Withdrew application / applicant deceased": "applicant_withdrew_or_deceased",
+                          "Refused final accommodation": "rejected_final_accommodation_offered",
+                          "Intentionally homeless from accommodation provided": "intentionally_homeless_from_accommodation_provided",
+                          "Local connection referral accepted by other LA": "accepted_by_another_la",
+                          "No longer eligible": "no_longer_eligible",
+                          "Notice served due to refusal to cooperate": "uncooperative_and_served_notice",
+                          "Not known": "not_known"},
+    'ta1': lambda prefix: {"Unnamed: 0": "system_id",
+                           "Unnamed: 1": "local_authority",
+                           "Households in temporary accommodation at end of quarter1": "households_in_ta",
+                           "Households in temporary accommodation at end of quarter1 children": "ta_households_with_children",
+                           "Unnamed: 8": "children_headcount_in_ta",
+                           "Bed and breakfast hotels (including shared annexes)": "bnb_ta_households",
+                           "Bed and breakfast hotels (including shared annexes) children": "bnb_ta_with_children",
+                           "Unnamed: 12": "bnb_ta_with_children_exceeding_6wks",
+                           "Unnamed: 13": "bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal",
+                           "Unnamed: 14": "bnb_ta_with_16yo_17yo_main_applicant",
+                           "Nightly paid, privately managed accommodation, self-contained": "nightly_paid_ta_households",
+                           "Nightly paid, privately managed accommodation, self-contained children": "nightly_paid_ta_with_children",
+                           "Hostels (including reception centres, emergency units and refuges)": "hostel_ta_households",
+                           "Hostels (including reception centres, emergency units and refuges) children": "hostel_ta_with_children",
+                           "Private sector accommodation leased by authority or by a registered provider": "private_sector_ta",
+                           "Private sector accommodation leased by authority or by a registered provider children": "private_sector_ta_with_children",
+                           "Local authority or Housing association (LA/HA) stock": "la_ha_owned_managed_ta_households",
+                           "Local authority or Housing association (LA/HA) stock children": "la_ha_owned_managed_ta_with_children",
+                           "Any other type of temporary accommodation (including private landlord and not known)2": "any_other_type_ta",
+                           "Any other type of temporary accommodation (including private landlord and not known)2 children": "any_other_type_ta_with_children",
+                           "In TA in another local authority district": "in_another_la_ta",
+                           "Duty owed, no accommodation secured3": "no_secured_accommodation_ta",
+                           "Duty owed, no accommodation secured3 children": "no_secured_accommodation_ta_with_children"},
+    'ta2': lambda prefix: {"Unnamed: 0": "system_id",
+                           "Unnamed: 1": "local_authority",
+                           "Unnamed: 4": "households_in_ta",
+                           "Couple with dependent children": "couple_with_children_ta",
+                           "Single parent with dependent children  -  Male": "single_father_with_children_ta",
+                           "Single parent with dependent children  -  Female": "single_mother_with_children_ta",
+                           "Single parent with dependent children  -  Other/gender not known": "single_parent_of_other_unknown_gender_with_children_ta",
+                           "Single adult  -  Male": "single_man_ta",
+                           "Single adult  -  Female": "single_woman_ta",
+                           "Single adult  -  Other/gender not known": "single_other_gender_ta",
+                           "All other household types4": "all_other_household_types_ta"}}
+LEGACY_FLT_COLS = {'a1': ['households_in_area_000s']}
+LEGACY_NEIGHBOURING_LAS = ['Southwark', 'Islington', 'Haringey', 'Lambeth', 'Tower Hamlets', 'Camden',
+                           'Waltham Forest', 'Hammersmith & Fulham', 'Newham']
+LA_NAMES = LEGACY_NEIGHBOURING_LAS + ['Hackney', 'Barnet', 'Bexley', 'Brent', 'Bromley', 'Croydon', 'Ealing',
+                                      'Enfield', 'Greenwich', 'Harrow', 'Havering', 'Hillingdon', 'Hounslow']
+
+# (use_func, sheet name, prefix) of each of the seven tabs
+TABS = [('a1', 'A1', 'prevention'),
+        ('a2', 'A2P', 'prevention'),
+        ('a2', 'A2R', 'relief'),
+        ('p1', 'P1', 'prevention'),
+        ('r1', 'R1', 'relief'),
+        ('ta1', 'TA1', 'prevention'),
+        ('ta2', 'TA2', 'prevention')]
+
+
+def legacy_clean_tab(xl_df, use_func, prefix, assign_col='quarter_ending', assign_val=202406,
+                     copy_each_step=False):
+    """the steps shared by the legacy clean_tab_* functions, without their progress prints
+    copy_each_step: deep copy the frame after every step, as the cleaners did before they were made copy-free"""
+
+    col_mapper = LEGACY_COL_MAPPERS[use_func](prefix)
+    sel_colnames = list(col_mapper.values())
+    fltg_cols = LEGACY_FLT_COLS.get(use_func, [])
+    col_list = sel_colnames[2:]
+    intg_cols = [col for col in col_list if col not in fltg_cols]
+    step = copy.deepcopy if copy_each_step else (lambda obj: obj)
+
+    df = step(xl_df)
+    df = step(df.dropna(axis='rows', thresh=1).reset_index(drop=True))
+    df = step(df.dropna(axis='columns', thresh=20))
+    df = step(df.rename(columns=col_mapper))
+    df = step(df.drop_duplicates())
+    df = step(df[sel_colnames])
+    start_index = df.loc[df['local_authority'] == 'ENGLAND'].index
+    df = step(df.iloc[start_index[0]:].reset_index(drop=True))
+    df = step(df.loc[df["system_id"].notna()].reset_index(drop=True))
+    df = step(df.dropna(axis='rows', thresh=3).reset_index(drop=True))
+    df.loc[:, assign_col] = assign_val
+    df = step(df)
+    df['is_neighbouring_la'] = df['local_authority'].apply(lambda x: 1 if x in LEGACY_NEIGHBOURING_LAS else 0)
+    for col in col_list:
+        df[col] = step(df[col].astype("str").str.replace("..", "", regex=False))
+    for col in fltg_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in intg_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+
+    return step(df)
+
+
+def synthetic_sheet(use_func, prefix):
+    """a sheet as pd.read_excel returns it: title rows, the ENGLAND total, one row per local authority with
+    '..' and 'x' markers, a duplicated row, a mostly blank row, a footnote and a mostly blank column"""
+
+    src_cols = list(LEGACY_COL_MAPPERS[use_func](prefix))
+    metric_cols = src_cols[2:]
+    flt_cols = {src_col for src_col, col in LEGACY_COL_MAPPERS[use_func](prefix).items()
+                if col in LEGACY_FLT_COLS.get(use_func, [])}
+    rng = np.random.default_rng(len(src_cols))
+
+    def metric_row(row_no):
+        row = dict()
+        for col_no, src_col in enumerate(metric_cols):
+            if (row_no + col_no) % 7 == 0:
+                row[src_col] = '..'
+            elif (row_no * col_no) % 11 == 5:
+                row[src_col] = 'x'
+            elif src_col in flt_cols:
+                row[src_col] = round(float(rng.uniform(50, 200)), 2)
+            else:
+                row[src_col] = int(rng.integers(0, 5000))
+        return row
+
+    rows = [{'Unnamed: 1': f'Table {use_func.upper()}: households by local authority'},
+            {'Unnamed: 1': 'England'},
+            dict(),
+            {'Unnamed: 0': 'E92000001', 'Unnamed: 1': 'ENGLAND', **metric_row(0)}]
+    for row_no, la_name in enumerate(LA_NAMES, start=1):
+        rows.append({'Unnamed: 0': f'E0900{row_no:04d}', 'Unnamed: 1': la_name, **metric_row(row_no)})
+    rows.append(dict(rows[-4]))
+    rows.append({'Unnamed: 0': 'E06000053', 'Unnamed: 1': 'Isles of Scilly'})
+    rows.append({'Unnamed: 1': 'Source: synthetic data', 'Unnamed: 99': 'see notes'})
+
+    return pd.DataFrame(rows, columns=src_cols + ['Unnamed: 99'])
+
+
+@pytest.mark.parametrize('use_func, sheet_name, prefix', TABS, ids=[tab[1] for tab in TABS])
+def test_clean_tab_matches_legacy_clean_tab(monkeypatch, use_func, sheet_name, prefix):
+    xl_df = synthetic_sheet(use_func, prefix)
+    monkeypatch.setattr(ProjUtil, 'pull_file_xl', staticmethod(lambda file_path, sheet_name, skiprows=0: xl_df))
+
+    cleaned = ProjUtil.clean_tab(abs_file_path=f'{sheet_name}.xlsx', use_func=use_func, sheet_name=sheet_name,
+                                 assign_val=202406, prefix=prefix,
+                                 la_groups={'is_neighbouring_la': LEGACY_NEIGHBOURING_LAS})
+    expected = legacy_clean_tab(xl_df, use_func, prefix, assign_val=202406)
+    # is_neighbouring_la is an int8 flag since the local authority groups moved to flag_la_groups
+    expected['is_neighbouring_la'] = expected['is_neighbouring_la'].astype('int8')
+
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert len(cleaned) == len(LA_NAMES) + 1
+    assert cleaned['is_neighbouring_la'].sum() == len(LEGACY_NEIGHBOURING_LAS)
+
+
+@pytest.mark.parametrize('use_func, sheet_name, prefix', TABS, ids=[tab[1] for tab in TABS])
+def test_copy_free_cleaning_matches_deep_copies(use_func, sheet_name, prefix):
+    xl_df = synthetic_sheet(use_func, prefix)
+    xl_before = xl_df.copy()
+
+    pd.testing.assert_frame_equal(legacy_clean_tab(xl_df, use_func, prefix),
+                                  legacy_clean_tab(xl_df, use_func, prefix, copy_each_step=True))
+    # the sheet may be shared through the workbook cache, so cleaning must leave it untouched
+    pd.testing.assert_frame_equal(xl_df, xl_before)
@@ -0,0 +1,49 @@
+"""peak traced allocation of cleaning the seven sheets with and without a deep copy after every step
+run as a script to print the numbers, from the repository root: PYTHONPATH=. python tests/test_clean_tab_memory.py"""
+
+import tracemalloc
+
+from helper_utils import ProjUtil
+from test_clean_tab import LEGACY_NEIGHBOURING_LAS, TABS, legacy_clean_tab, synthetic_sheet
+
+
+def traced_peak(clean_func, *args, **kwargs) -> int:
+    """peak bytes allocated while clean_func runs"""
+
+    tracemalloc.start()
+    try:
+        clean_func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_peaks() -> dict:
+    """{variant: peak bytes summed over the seven sheets}"""
+
+    xl_dfs = {sheet_name: synthetic_sheet(use_func, prefix) for use_func, sheet_name, prefix in TABS}
+    peaks = {'deep copy per step': 0, 'copy-free': 0, 'clean_tab': 0}
+    for use_func, sheet_name, prefix in TABS:
+        xl_df = xl_dfs[sheet_name]
+        peaks['deep copy per step'] += traced_peak(legacy_clean_tab, xl_df, use_func, prefix, copy_each_step=True)
+        peaks['copy-free'] += traced_peak(legacy_clean_tab, xl_df, use_func, prefix)
+        original_pull = ProjUtil.pull_file_xl
+        ProjUtil.pull_file_xl = staticmethod(lambda file_path, sheet_name, skiprows=0, _df=xl_df: _df)
+        try:
+            peaks['clean_tab'] += traced_peak(ProjUtil.clean_tab, abs_file_path=f'{sheet_name}.xlsx',
+                                              use_func=use_func, sheet_name=sheet_name, prefix=prefix,
+                                              la_groups={'is_neighbouring_la': LEGACY_NEIGHBOURING_LAS})
+        finally:
+            ProjUtil.pull_file_xl = original_pull
+    return peaks
+
+
+def test_copy_free_cleaning_lowers_peak_allocation():
+    peaks = measure_peaks()
+    assert peaks['copy-free'] < peaks['deep copy per step']
+    assert peaks['clean_tab'] < peaks['deep copy per step']
+
+
+if __name__ == '__main__':
+    for variant, peak in measure_peaks().items():
+        print(f'{variant:>20}: {peak / 1024:8.1f} KiB')
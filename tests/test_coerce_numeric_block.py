@@ -0,0 +1,59 @@
+"""coerce_numeric_block turns the metric cells of a sheet into nullable numbers"""
+
+import numpy as np
+import pandas as pd
+
+from helper_utils import ProjUtil
+
+
+def metric_frame(**cols):
+    return pd.DataFrame({col: pd.Series(vals, dtype=object) for col, vals in cols.items()})
+
+
+def test_boolean_cells_are_coerced_to_na():
+    df = metric_frame(households=[True, False, 3, np.bool_(True)])
+
+    out, coerced = ProjUtil.coerce_numeric_block(df, int_cols=['households'], return_counts=True)
+
+    assert out['households'].isna().tolist() == [True, True, False, True]
+    assert out['households'].iloc[2] == 3
+    assert coerced.to_dict() == {'households': 3}
+
+
+def test_markers_only_match_whole_cells():
+    # the legacy str.replace('..', '') turned '1..2' into 12
+    df = metric_frame(households=['1..2', '..', 7])
+
+    out = ProjUtil.coerce_numeric_block(df, int_cols=['households'])
+
+    assert out['households'].isna().tolist() == [True, True, False]
+    assert str(out['households'].dtype) == 'Int64'
+
+
+def test_missing_value_markers_become_na_without_being_counted():
+    df = metric_frame(households=['..', 'x', '-', '[c]', None, 5],
+                      households_in_area_000s=['..', 'x', '-', '[c]', np.nan, 1.5])
+
+    out, coerced = ProjUtil.coerce_numeric_block(df, int_cols=['households'], flt_cols=['households_in_area_000s'],
+                                                 return_counts=True)
+
+    assert out['households'].isna().sum() == 5
+    assert out['households_in_area_000s'].isna().sum() == 5
+    assert out['households'].iloc[5] == 5
+    assert out['households_in_area_000s'].iloc[5] == 1.5
+    assert str(out['households_in_area_000s'].dtype) == 'float64'
+    assert coerced.to_dict() == {'households': 0, 'households_in_area_000s': 0}
+
+
+def test_unknown_cells_are_counted_per_column():
+    df = metric_frame(households=['n/a', '12', 'see note', '..'],
+                      relief_duty_owed=[4, '*', 6, 'x'],
+                      prevention_duty_owed=[1, 2, 3, 4])
+
+    out, coerced = ProjUtil.coerce_numeric_block(df, int_cols=['households', 'relief_duty_owed',
+                                                               'prevention_duty_owed'], return_counts=True)
+
+    assert coerced.to_dict() == {'households': 2, 'relief_duty_owed': 1, 'prevention_duty_owed': 0}
+    assert out['households'].tolist()[1] == 12
+    assert out['households'].isna().sum() == 3
+    assert out['relief_duty_owed'].isna().sum() == 2
@@ -0,0 +1,56 @@
+"""flag_la_groups against the per-row apply lambda it replaced"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl_settings import etl_var as evr
+from helper_utils import ProjUtil
+
+NEIGHBOURING_LAS = ['Southwark', 'Islington', 'Haringey', 'Lambeth', 'Tower Hamlets', 'Camden',
+                    'Waltham Forest', 'Hammersmith & Fulham', 'Newham']
+LA_GROUPS = {'is_neighbouring_la': NEIGHBOURING_LAS,
+             'is_inner_london_la': ['Hackney', 'Camden', 'Islington', 'City of London']}
+
+
+def legacy_flag(la_ser, group_las):
+    return la_ser.apply(lambda x: 1 if x in group_las else 0)
+
+
+@pytest.mark.parametrize('categorical_input', [False, True])
+@pytest.mark.parametrize('categorical_la', [False, True])
+def test_flags_and_codes_match_legacy_apply(categorical_input, categorical_la):
+    # 'Newham' and 'City of London' are group members missing from the frame, 'Hackney' is in one group only,
+    # 'Barnet' in none, and one local authority is blank
+    la_names = ['ENGLAND', 'Hackney', 'Camden', 'Barnet', 'Southwark', np.nan, 'Islington', 'Camden', 'Croydon']
+    la_ser = pd.Series(la_names, dtype=object)
+    if categorical_input:
+        # unused categories must not change the flags either
+        la_ser = la_ser.astype(pd.CategoricalDtype(sorted(set(la_names) - {np.nan}) + ['Newham', 'Zzz']))
+    df = pd.DataFrame({'system_id': [f'E0900{i:04d}' for i in range(len(la_names))], 'local_authority': la_ser})
+
+    out = ProjUtil.flag_la_groups(df.copy(), la_groups=LA_GROUPS, categorical_la=categorical_la)
+
+    for flag_col, group_las in LA_GROUPS.items():
+        expected = legacy_flag(pd.Series(la_names, dtype=object), group_las).astype('int8')
+        pd.testing.assert_series_equal(out[flag_col], expected, check_names=False)
+        assert out[flag_col].dtype == np.int8
+
+    la_out = out['local_authority']
+    if categorical_la:
+        assert isinstance(la_out.dtype, pd.CategoricalDtype)
+        codes = la_out.cat.codes.to_numpy()
+        assert (codes[pd.isna(la_names)] == -1).all()
+        decoded = [la_out.cat.categories[code] if code >= 0 else np.nan for code in codes]
+        pd.testing.assert_series_equal(pd.Series(decoded, dtype=object), pd.Series(la_names, dtype=object))
+    else:
+        pd.testing.assert_series_equal(la_out, df['local_authority'])
+
+
+def test_no_groups_adds_no_flags():
+    df = pd.DataFrame({'local_authority': ['Hackney', 'Camden']})
+    assert list(ProjUtil.flag_la_groups(df.copy()).columns) == ['local_authority']
+
+
+def test_staged_flags_are_registered_groups():
+    assert set(evr['staged_la_groups']) <= set(evr['la_groups'])
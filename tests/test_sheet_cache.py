@@ -0,0 +1,70 @@
+"""the on-disk sheet cache falls back to parsing the source file when its entries cannot be read"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from helper_utils import ProjUtil
+
+
+@pytest.fixture
+def sheet_cache(tmp_path):
+    cache_dir = str(tmp_path / 'sheet_cache')
+    ProjUtil.configure_sheet_cache(cache_dir=cache_dir)
+    yield cache_dir
+    ProjUtil.disable_sheet_cache()
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    file_path = str(tmp_path / 'Detailed_LA_202406.xlsx')
+    with pd.ExcelWriter(file_path) as writer:
+        pd.DataFrame({'system_id': ['E09000012'], 'households': [12]}).to_excel(writer, sheet_name='A1',
+                                                                                index=False)
+        pd.DataFrame({'system_id': ['E09000012'], 'households': [34]}).to_excel(writer, sheet_name='TA1',
+                                                                                index=False)
+    return file_path
+
+
+def test_corrupt_entry_is_a_cache_miss(sheet_cache, workbook):
+    first = ProjUtil.pull_workbook_xl(workbook, ['A1', 'TA1'])
+    entry_path = ProjUtil.get_sheet_cache_path(workbook, 'A1')
+    with open(entry_path, 'wb') as fh:
+        fh.write(b'\x80\x05junk')
+
+    assert ProjUtil.read_sheet_cache(workbook, 'A1') is None
+    assert not os.path.exists(entry_path)
+
+    # the workbook is parsed again and the entry rewritten
+    second = ProjUtil.pull_workbook_xl(workbook, ['A1', 'TA1'])
+    pd.testing.assert_frame_equal(second['A1'], first['A1'])
+    pd.testing.assert_frame_equal(ProjUtil.read_sheet_cache(workbook, 'A1'), first['A1'])
+
+
+def test_corrupt_entry_does_not_fail_the_workbook(sheet_cache, workbook):
+    ProjUtil.pull_workbook_xl(workbook, ['A1', 'TA1'])
+    with open(ProjUtil.get_sheet_cache_path(workbook, 'TA1'), 'wb') as fh:
+        fh.write(b'not a pickle')
+
+    ProjUtil.enable_workbook_cache(['A1', 'TA1'])
+    try:
+        ProjUtil.prime_workbook_cache([workbook])
+        assert not ProjUtil.workbook_failures
+        assert ProjUtil.pull_file_xl(workbook, 'TA1')['households'].tolist() == [34]
+    finally:
+        ProjUtil.clear_workbook_cache()
+
+
+@pytest.mark.parametrize('hash_text', ['{"truncated', '["not", "an", "object"]'])
+def test_unreadable_hash_file_is_ignored(tmp_path, workbook, hash_text):
+    cache_dir = tmp_path / 'sheet_cache'
+    cache_dir.mkdir()
+    (cache_dir / 'file_hashes.json').write_text(hash_text, encoding='utf8')
+
+    ProjUtil.configure_sheet_cache(cache_dir=str(cache_dir))
+    try:
+        assert ProjUtil.sheet_cache_hashes == dict()
+        assert ProjUtil.pull_workbook_xl(workbook, ['A1'])['A1']['households'].tolist() == [12]
+    finally:
+        ProjUtil.disable_sheet_cache()
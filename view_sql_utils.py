@@ -0,0 +1,451 @@
+import argparse
+import logging
+import os
+import re
+import time
+import pandas as pd
+from sqlalchemy import text
+from helper_utils import ProjUtil as pjl
+
+logger = logging.getLogger(__name__)
+
+
+class ViewSqlUtil:
+
+    # spec of each core summary view, from which generate_view_query builds its sql
+    # staging_table: table summarised; value_cols: metrics reported as they are
+    # share_cols: metrics reported as they are and as a share of the denominator column (perc_ prefixed)
+    # metric_prefix: prefix of the share_cols metric names; avg_round: decimals of a neighbouring average
+    # (default 0); perc_round: decimals of the shares; extra_metrics: {metric: template over {column}}
+    # metric_names: {generated name: metric name} where the published name differs
+    share_reasons = ['family_or_friend_terminations', 'ast_private_rented_terminations',
+                     'domestic_abuse_terminations', 'non_violent_relationship_breakdown_terminations',
+                     'social_rented_tenancy_terminations', 'supported_housing_terminations',
+                     'non_ast_private_rented_terminations', 'other_violence_or_harassment_terminations',
+                     'institution_departures', 'home_office_asylum_support_terminations',
+                     'new_home_for_illness_or_disability', 'loss_of_placement_or_sponsorship',
+                     'for_other_or_unknown_reasons']
+    view_specs = {
+        'initial_asmt_summary': {
+            'staging_table': 'tab_a1', 'value_cols': ['initial_assessments'],
+            'share_cols': ['owed_prevention_or_relief_duty', 'prevention_duty_owed', 'relief_duty_owed'],
+            'metric_prefix': '', 'denominator': 'initial_assessments', 'perc_round': 2,
+            'avg_round': {'households_in_area_000s': 3},
+            'extra_metrics': {
+                'perc_initial_assessments':
+                    'round({initial_assessments} / ({households_in_area_000s} * 1000::numeric), 2)',
+                'households_in_area': 'round({households_in_area_000s} * 1000::numeric, 0)'}},
+        'prevention_duty_summary': {
+            'staging_table': 'tab_a2p', 'value_cols': ['prevention_duty_owed'], 'share_cols': share_reasons,
+            'metric_prefix': 'pdo_from_', 'denominator': 'prevention_duty_owed', 'perc_round': 2,
+            'metric_names': {'perc_pdo_from_family_or_friend_terminations':
+                             'perc_pdo_from_family_friend_terminations'}},
+        'relief_duty_summary': {
+            'staging_table': 'tab_a2r', 'value_cols': ['relief_duty_owed'], 'share_cols': share_reasons,
+            'metric_prefix': 'rdo_from_', 'denominator': 'relief_duty_owed', 'perc_round': 2,
+            'metric_names': {'perc_rdo_from_family_or_friend_terminations':
+                             'perc_rdo_from_family_friend_terminations'}},
+        'prevention_duty_ending_summary': {
+            'staging_table': 'tab_p1', 'value_cols': ['prevention_duty_ended'],
+            'share_cols': ['secured_accommodation', 'homelessness', 'contact_lost',
+                           'no_further_action_after_56days', 'applicant_withdrew_or_deceased', 'no_longer_eligible',
+                           'rejected_offered_accommodation', 'uncooperative', 'not_known'],
+            'metric_prefix': 'pde_by_', 'denominator': 'prevention_duty_ended', 'perc_round': 2},
+        'relief_duty_ending_summary': {
+            'staging_table': 'tab_r1', 'value_cols': ['relief_duty_ended'],
+            'share_cols': ['secured_accommodation', 'after_56days_deadline', 'contact_lost',
+                           'applicant_withdrew_or_deceased', 'rejected_final_accommodation_offered',
+                           'intentionally_homeless_from_accommodation_provided', 'accepted_by_another_la',
+                           'no_longer_eligible', 'uncooperative_and_served_notice', 'not_known'],
+            'metric_prefix': 'rde_by_', 'denominator': 'relief_duty_ended', 'perc_round': 2},
+        'temp_accommodation_summary': {
+            'staging_table': 'tab_ta1', 'value_cols': ['households_in_ta', 'children_headcount_in_ta'],
+            'share_cols': ['ta_households_with_children', 'bnb_ta_households', 'bnb_ta_with_children',
+                           'bnb_ta_with_children_exceeding_6wks',
+                           'bnb_ta_with_children_exceeding_6wks_awaiting_review_or_appeal',
+                           'bnb_ta_with_16yo_17yo_main_applicant', 'nightly_paid_ta_households',
+                           'nightly_paid_ta_with_children', 'hostel_ta_households', 'hostel_ta_with_children',
+                           'private_sector_ta', 'private_sector_ta_with_children',
+                           'la_ha_owned_managed_ta_households', 'la_ha_owned_managed_ta_with_children',
+                           'any_other_type_ta', 'any_other_type_ta_with_children', 'in_another_la_ta',
+                           'no_secured_accommodation_ta', 'no_secured_accommodation_ta_with_children'],
+            'metric_prefix': '', 'denominator': 'households_in_ta', 'perc_round': 2},
+        'temp_accommodation_households_summary': {
+            'staging_table': 'tab_ta2', 'value_cols': ['households_in_ta'],
+            'share_cols': ['couple_with_children_ta', 'single_father_with_children_ta',
+                           'single_mother_with_children_ta', 'single_parent_of_other_unknown_gender_with_children_ta',
+                           'single_man_ta', 'single_woman_ta', 'single_other_gender_ta',
+                           'all_other_household_types_ta'],
+            'metric_prefix': '', 'denominator': 'households_in_ta', 'perc_round': 2}}
+    # core summary materialized views and the staging table each one summarises
+    summary_views = {view_name: spec['staging_table'] for view_name, spec in view_specs.items()}
+    # longest identifier postgres keeps, longer metric names are truncated to it like the legacy aliases were
+    max_identifier_len = 63
+    # columns of the public views of access_dql.sql, in their order
+    access_view_cols = ['quarter_ending', 'qtr_year', 'qtr_month', 'year_qtr', 'hackney_la', 'neighbouring_la',
+                        'metrics', 'difference']
+    # quarter_ind columns that identify a row rather than hold a metric (kept out of the unpivot)
+    unpivot_id_cols = ['local_authority', 'system_id', 'quarter_ending', 'qtr_year', 'qtr_month', 'year_qtr']
+    # CREATE MATERIALIZED VIEW statement of core_dml.sql: groups view name and select query
+    mview_pattern = re.compile(r"CREATE MATERIALIZED VIEW IF NOT EXISTS core\.(\w+)\nTABLESPACE pg_default\nAS\n"
+                               r"(.*?)\nWITH DATA;", flags=re.DOTALL)
+    # jsonb unpivot of core_dml.sql: serialises each quarter_ind row and parses every cell back to numeric
+    jsonb_unpivot_pattern = re.compile(r"( +)jsonb_each_text\.key AS metrics,\n +jsonb_each_text\.value::numeric "
+                                       r"AS households\n( +)FROM quarter_ind,\n +LATERAL jsonb_each_text\(.*?\) "
+                                       r"jsonb_each_text\(key, value\)")
+
+    @staticmethod
+    def read_view_queries(sql_path: str = 'core_dml.sql') -> dict:
+        """select query of each core materialized view in a ddl file
+        output: {view name: query}"""
+
+        with open(sql_path, encoding='utf8') as fh:
+            ddl = fh.read()
+        return {view_name: view_query for view_name, view_query in ViewSqlUtil.mview_pattern.findall(ddl)}
+
+    @staticmethod
+    def get_cte_columns(view_query: str, cte_name: str) -> list:
+        """output column names of a CTE in a view query, in select order
+        each select item sits on its own line, ending in either <alias>.<column> or AS <column>"""
+
+        cte_body = re.search(rf"\b{cte_name} AS \(.*?\n(.*?)\n +FROM ", view_query, flags=re.DOTALL).group(1)
+        cte_cols = list()
+        for line in cte_body.split('\n'):
+            col_match = re.match(r"^\s*(?:SELECT\s+)?(?:\w+\.(\w+)|.* AS (\w+)),?$", line)
+            if col_match:
+                cte_cols.append(col_match.group(1) or col_match.group(2))
+        return cte_cols
+
+    @staticmethod
+    def unpivot_lateral_sql(metric_cols: 'list of columns', source_alias: str = 'quarter_ind', style='values',
+                            indent: str = '            ') -> str:
+        """lateral join that turns the metric columns of source_alias into (metrics, households) rows
+        style: 'values' builds a VALUES list, 'unnest' zips two arrays; either way each cell is only cast
+        to numeric, never serialised
+        output: sql text of the join, to follow 'FROM <source_alias>'"""
+
+        if style == 'values':
+            value_rows = f',\n{indent}    '.join(f"('{col}'::text, {source_alias}.{col}::numeric)"
+                                                 for col in metric_cols)
+            return f"CROSS JOIN LATERAL (VALUES\n{indent}    {value_rows}) unpivot_cols(metrics, households)"
+        if style == 'unnest':
+            col_names = ', '.join(f"'{col}'" for col in metric_cols)
+            col_values = f',\n{indent}    '.join(f'{source_alias}.{col}::numeric' for col in metric_cols)
+            return (f"CROSS JOIN LATERAL unnest(ARRAY[{col_names}]::text[],\n{indent}    ARRAY[{col_values}]) "
+                    f"unpivot_cols(metrics, households)")
+        raise ValueError(f"unknown unpivot style {style!r}, use 'values' or 'unnest'")
+
+    @staticmethod
+    def typed_unpivot_query(view_query: str, style='values') -> str:
+        """rewrite the jsonb_each_text unpivot of a core view query as a typed lateral unpivot
+        the metric columns are those of the quarter_ind CTE, less the row identifiers
+        output: view query"""
+
+        metric_cols = [col for col in ViewSqlUtil.get_cte_columns(view_query, 'quarter_ind')
+                       if col not in ViewSqlUtil.unpivot_id_cols]
+
+        def replace_unpivot(unpivot_match):
+            col_indent, from_indent = unpivot_match.groups()
+            return (f"{col_indent}unpivot_cols.metrics,\n{col_indent}unpivot_cols.households\n"
+                    f"{from_indent}FROM quarter_ind\n{col_indent}"
+                    + ViewSqlUtil.unpivot_lateral_sql(metric_cols, style=style, indent=col_indent))
+
+        typed_query, n_replaced = ViewSqlUtil.jsonb_unpivot_pattern.subn(replace_unpivot, view_query)
+        if n_replaced != 1:
+            raise ValueError(f'expected one jsonb unpivot in the view query, found {n_replaced}')
+        return typed_query
+
+    @staticmethod
+    def typed_unpivot_ddl(sql_path: str = 'core_dml.sql', style='values') -> str:
+        """core_dml.sql with every jsonb unpivot replaced by a typed lateral unpivot
+        the result is a drop-in alternative to core_dml.sql (run access_dql.sql after it, as usual)
+        output: ddl text"""
+
+        with open(sql_path, encoding='utf8') as fh:
+            ddl = fh.read()
+
+        def replace_query(mview_match):
+            view_name, view_query = mview_match.groups()
+            typed_query = ViewSqlUtil.typed_unpivot_query(view_query, style=style)
+            return mview_match.group(0).replace(view_query, typed_query)
+
+        return ViewSqlUtil.mview_pattern.sub(replace_query, ddl)
+
+    @staticmethod
+    def get_view_metrics(view_name: str) -> dict:
+        """metrics of a core view from its spec, in publishing order
+        each metric is a template over the staging columns it needs, written as {column}
+        output: {metric name: template}"""
+
+        spec = ViewSqlUtil.view_specs[view_name]
+        prefix, denominator = spec.get('metric_prefix', ''), spec['denominator']
+        view_metrics = {col: f'{{{col}}}' for col in spec['value_cols']}
+        for col in spec['share_cols']:
+            view_metrics[f'{prefix}{col}'] = f'{{{col}}}'
+            view_metrics[f'perc_{prefix}{col}'] = f"round({{{col}}} / {{{denominator}}}, {spec.get('perc_round', 2)})"
+        view_metrics.update(spec.get('extra_metrics', dict()))
+        metric_names = spec.get('metric_names', dict())
+        return {metric_names.get(metric, metric)[:ViewSqlUtil.max_identifier_len]: template
+                for metric, template in view_metrics.items()}
+
+    @staticmethod
+    def generate_view_query(view_name: str, indent: str = '            ') -> str:
+        """select query of a core view, generated from its spec
+        one scan of the staging table aggregates hackney's row and the neighbouring average of every column
+        side by side per quarter (FILTER), then one lateral VALUES row per metric holds both series, so the
+        percentages are worked out once per quarter instead of once per local authority and re-pivoted
+        assumes at most one hackney row per quarter_ending in the staging table
+        output: view query"""
+
+        spec = ViewSqlUtil.view_specs[view_name]
+        tab = spec['staging_table']
+        view_metrics = ViewSqlUtil.get_view_metrics(view_name)
+        source_cols = list(dict.fromkeys(col for template in view_metrics.values()
+                                         for col in re.findall(r'\{(\w+)\}', template)))
+        if any(len(f'h_{col}') > ViewSqlUtil.max_identifier_len for col in source_cols):
+            raise ValueError(f'staging column name too long to alias in {view_name}')
+
+        hackney_filter = f"{tab}.local_authority::text = 'Hackney'::text"
+        neighbour_filter = f"{tab}.is_neighbouring_la = 1"
+        agg_cols = list()
+        for col in source_cols:
+            agg_cols.append(f"max({tab}.{col}::numeric) FILTER (WHERE {hackney_filter}) AS h_{col}")
+            agg_cols.append(f"round(avg({tab}.{col}) FILTER (WHERE {neighbour_filter}), "
+                            f"{spec.get('avg_round', dict()).get(col, 0)}) AS n_{col}")
+        metric_rows = list()
+        for metric, template in view_metrics.items():
+            hackney_expr = template.format(**{col: f'quarterly.h_{col}' for col in source_cols})
+            neighbour_expr = template.format(**{col: f'quarterly.n_{col}' for col in source_cols})
+            metric_rows.append(f"('{metric}'::text, {hackney_expr}, {neighbour_expr})")
+
+        agg_sep, row_sep = f',\n{indent}', f',\n{indent}    '
+        return (f" WITH quarterly AS ( -- hackney's values and the neighbouring councils' averages, in one scan\n"
+                f"         SELECT {tab}.quarter_ending,\n"
+                f"{indent}{agg_sep.join(agg_cols)}\n"
+                f"           FROM staging.{tab}\n"
+                f"          WHERE {neighbour_filter} OR {hackney_filter}\n"
+                f"          GROUP BY {tab}.quarter_ending\n"
+                f"        ), metric_vals AS ( -- one row per quarter and metric, holding both series\n"
+                f"         SELECT quarterly.quarter_ending,\n"
+                f"{indent}\"left\"(quarterly.quarter_ending::text, 4)::integer AS qtr_year,\n"
+                f"{indent}\"right\"(quarterly.quarter_ending::text, 2)::integer AS qtr_month,\n"
+                f"{indent}metric_rows.metrics,\n"
+                f"{indent}metric_rows.hackney_la,\n"
+                f"{indent}metric_rows.neighbouring_la\n"
+                f"           FROM quarterly\n"
+                f"{indent}CROSS JOIN LATERAL (VALUES\n"
+                f"{indent}    {row_sep.join(metric_rows)}) metric_rows(metrics, hackney_la, neighbouring_la)\n"
+                f"        )\n"
+                f" SELECT quarter_ending,\n"
+                f"    qtr_year,\n"
+                f"        CASE\n"
+                f"            WHEN qtr_month = 3 THEN 'q1'::text\n"
+                f"            WHEN qtr_month = 6 THEN 'q2'::text\n"
+                f"            WHEN qtr_month = 9 THEN 'q3'::text\n"
+                f"            WHEN qtr_month = 12 THEN 'q4'::text\n"
+                f"            ELSE 'q0'::text\n"
+                f"        END AS year_qtr,\n"
+                f"    qtr_month,\n"
+                f"    metrics,\n"
+                f"    hackney_la,\n"
+                f"    neighbouring_la,\n"
+                f"    hackney_la - neighbouring_la AS difference\n"
+                f"   FROM metric_vals\n"
+                f"  ORDER BY quarter_ending")
+
+    @staticmethod
+    def generate_core_ddl(view_names: 'list of core views' = None) -> str:
+        """ddl of the generated core views, laid out like core_dml.sql (same views, indexes and owner)
+        output: ddl text"""
+
+        ddl_parts = ['-- generated by view_sql_utils.py from ViewSqlUtil.view_specs, do not edit by hand\n',
+                     'CREATE SCHEMA IF NOT EXISTS core;\n']
+        for view_name in view_names or ViewSqlUtil.view_specs:
+            ddl_parts.append(f"-- View: core.{view_name}\n\n"
+                             f"DROP MATERIALIZED VIEW IF EXISTS core.{view_name} CASCADE;\n\n"
+                             f"CREATE MATERIALIZED VIEW IF NOT EXISTS core.{view_name}\n"
+                             f"TABLESPACE pg_default\n"
+                             f"AS\n"
+                             f"{ViewSqlUtil.generate_view_query(view_name)}\n"
+                             f"WITH DATA;\n\n"
+                             f"-- unique key that lets the etl refresh the view CONCURRENTLY, without blocking readers\n"
+                             f"CREATE UNIQUE INDEX IF NOT EXISTS {view_name}_qtr_metrics_uidx\n"
+                             f"    ON core.{view_name} (quarter_ending, metrics);\n\n"
+                             f"ALTER TABLE IF EXISTS core.{view_name}\n"
+                             f"    OWNER TO postgres;\n")
+        return '\n'.join(ddl_parts)
+
+    @staticmethod
+    def generate_access_ddl(view_names: 'list of core views' = None) -> str:
+        """ddl of the public views over the core views, as in access_dql.sql
+        output: ddl text"""
+
+        ddl_parts = list()
+        select_cols = ',\n    '.join(ViewSqlUtil.access_view_cols)
+        for view_name in view_names or ViewSqlUtil.view_specs:
+            ddl_parts.append(f"-- View: public.{view_name}\n\n"
+                             f"DROP VIEW IF EXISTS public.{view_name};\n\n"
+                             f"CREATE OR REPLACE VIEW public.{view_name}\n"
+                             f" AS\n"
+                             f" SELECT \n"
+                             f"    {select_cols}\n"
+                             f"   FROM core.{view_name};\n\n"
+                             f"ALTER TABLE public.{view_name}\n"
+                             f"    OWNER TO postgres;\n")
+        return '\n'.join(ddl_parts)
+
+    @staticmethod
+    def apply_generated_views(db_engine: 'sqlalchemy engine', view_names: 'list of core views' = None):
+        """replace core views and their public views with the generated ones, in one transaction"""
+
+        ViewSqlUtil.apply_ddl(db_engine, ViewSqlUtil.generate_core_ddl(view_names) + '\n'
+                              + ViewSqlUtil.generate_access_ddl(view_names))
+
+    @staticmethod
+    def apply_ddl(db_engine: 'sqlalchemy engine', ddl: str):
+        """run a ddl script against the database in one transaction
+        the reflected table metadata is forgotten afterwards, as the script may have changed any table"""
+
+        with db_engine.begin() as db_conn:
+            db_conn.exec_driver_sql(ddl)
+        pjl.invalidate_table_metadata()
+        logger.info('DDL APPLIED')
+
+    @staticmethod
+    def time_mview_refresh(db_engine: 'sqlalchemy engine', mview_name: str, repeats: int = 3) -> list:
+        """wall time in seconds of each of `repeats` plain refreshes of a materialized view"""
+
+        refresh_times = list()
+        for _ in range(repeats):
+            with db_engine.begin() as db_conn:
+                start_time = time.perf_counter()
+                db_conn.execute(text(f"REFRESH MATERIALIZED VIEW {mview_name}"))
+                refresh_times.append(time.perf_counter() - start_time)
+        return refresh_times
+
+    @staticmethod
+    def benchmark_view_variants(db_engine: 'sqlalchemy engine', view_variants: dict, repeats: int = 3,
+                                bench_schema: str = 'core') -> 'pd.DataFrame':
+        """time the refresh of alternative queries of each view against the same staging data
+        view_variants: {view name: {variant: query}}, the first variant of a view is its reference
+        each variant is created as a scratch materialized view <bench_schema>.bench_<view>_<variant>, checked
+        to hold exactly the rows of the reference (EXCEPT ALL both ways), and dropped afterwards
+        output: dataframe with one row per view and variant"""
+
+        bench_rows = list()
+        for view_name, variant_queries in view_variants.items():
+            bench_names = dict()
+            try:
+                for variant, variant_query in variant_queries.items():
+                    bench_names[variant] = f'{bench_schema}.bench_{view_name}_{variant}'
+                    ViewSqlUtil.apply_ddl(db_engine, f"DROP MATERIALIZED VIEW IF EXISTS {bench_names[variant]};\n"
+                                                     f"CREATE MATERIALIZED VIEW {bench_names[variant]} AS\n"
+                                                     f"{variant_query}\nWITH NO DATA;")
+                ref_name = next(iter(bench_names.values()))
+                for variant, bench_name in bench_names.items():
+                    refresh_times = ViewSqlUtil.time_mview_refresh(db_engine, bench_name, repeats=repeats)
+                    with db_engine.connect() as db_conn:
+                        n_rows = db_conn.execute(text(f"SELECT count(*) FROM {bench_name}")).scalar()
+                        n_diff = db_conn.execute(text(
+                            f"SELECT count(*) FROM ((SELECT * FROM {bench_name} EXCEPT ALL "
+                            f"SELECT * FROM {ref_name}) UNION ALL (SELECT * FROM "
+                            f"{ref_name} EXCEPT ALL SELECT * FROM {bench_name})) diff")).scalar()
+                    bench_rows.append({'view': view_name, 'variant': variant, 'rows': n_rows,
+                                       'identical': n_diff == 0, 'best_s': min(refresh_times),
+                                       'median_s': sorted(refresh_times)[len(refresh_times) // 2]})
+            finally:
+                ViewSqlUtil.apply_ddl(db_engine, '\n'.join(f"DROP MATERIALIZED VIEW IF EXISTS {bench_name};"
+                                                           for bench_name in bench_names.values()))
+
+        bench_df = pd.DataFrame(bench_rows)
+        logger.info('refresh timings:\n%s', bench_df.to_string(index=False))
+        return bench_df
+
+    @staticmethod
+    def benchmark_unpivot(db_engine: 'sqlalchemy engine', sql_path: str = 'core_dml.sql', repeats: int = 3,
+                          styles=('jsonb', 'values', 'unnest'), bench_schema: str = 'core') -> 'pd.DataFrame':
+        """time the refresh of every core view with each unpivot style against the same staging data
+        the first style (the jsonb original by default) is the reference the others must match
+        output: dataframe with one row per view and style"""
+
+        view_variants = {view_name: {style: view_query if style == 'jsonb'
+                                     else ViewSqlUtil.typed_unpivot_query(view_query, style=style)
+                                     for style in styles}
+                         for view_name, view_query in ViewSqlUtil.read_view_queries(sql_path).items()}
+        return ViewSqlUtil.benchmark_view_variants(db_engine, view_variants, repeats=repeats,
+                                                   bench_schema=bench_schema)
+
+    @staticmethod
+    def check_generated_views(db_engine: 'sqlalchemy engine', sql_path: str = 'core_dml.sql', repeats: int = 3,
+                              bench_schema: str = 'core') -> 'pd.DataFrame':
+        """regression check of the single-scan generated views against the legacy views of core_dml.sql
+        each pair is refreshed side by side on the current staging data, timed, and compared row for row
+        output: dataframe with one row per view and variant (legacy, single_scan)"""
+
+        view_variants = {view_name: {'legacy': view_query,
+                                     'single_scan': ViewSqlUtil.generate_view_query(view_name)}
+                         for view_name, view_query in ViewSqlUtil.read_view_queries(sql_path).items()}
+        check_df = ViewSqlUtil.benchmark_view_variants(db_engine, view_variants, repeats=repeats,
+                                                       bench_schema=bench_schema)
+        if not check_df['identical'].all():
+            mismatched = check_df.loc[~check_df['identical'], 'view'].tolist()
+            raise ValueError(f'generated views differ from the legacy views: {mismatched}')
+        return check_df
+
+if __name__ == "__main__":
+    from pg_settings import pg_var as pvr
+    from etl_settings import etl_var as evr
+
+    parser = argparse.ArgumentParser(description="Generate core summary views")
+    parser.add_argument('--style', choices=['values', 'unnest'], default='values',
+                        help="lateral unpivot used in place of jsonb_each_text")
+    parser.add_argument('--write', metavar='PATH',
+                        help="write the generated alternative to core_dml.sql to PATH")
+    parser.add_argument('--apply', action='store_true',
+                        help="replace the core views in the database with the generated ones")
+    parser.add_argument('--write-core', metavar='PATH',
+                        help="write the core views generated from the view specs to PATH")
+    parser.add_argument('--write-access', metavar='PATH',
+                        help="write the public views over the generated core views to PATH")
+    parser.add_argument('--apply-generated', action='store_true',
+                        help="replace the core and public views in the database with the ones generated from the "
+                             "view specs")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time the refresh of every view with the jsonb, values and unnest unpivots")
+    parser.add_argument('--check-generated', action='store_true',
+                        help="check the generated views return exactly the rows of the legacy views, timing both")
+    parser.add_argument('--repeats', type=int, default=3, help="refreshes per view and variant when benchmarking")
+    args = parser.parse_args()
+    pjl.configure_logging(evr['log_level'])
+
+    typed_ddl = ViewSqlUtil.typed_unpivot_ddl(style=args.style)
+    if args.write:
+        with open(args.write, 'w', encoding='utf8') as fh:
+            fh.write(typed_ddl)
+    if args.write_core:
+        with open(args.write_core, 'w', encoding='utf8') as fh:
+            fh.write(ViewSqlUtil.generate_core_ddl())
+    if args.write_access:
+        with open(args.write_access, 'w', encoding='utf8') as fh:
+            fh.write(ViewSqlUtil.generate_access_ddl())
+    if args.apply or args.apply_generated or args.benchmark or args.check_generated:
+        dbase_cred = pjl.dbase_conn_from_settings(pvr)
+        dbase_cred['connection'].close()
+        dbase_engine = dbase_cred['engine']
+        # load the metadata persisted by main.py, so that applying ddl clears it there too
+        metadata_file = '/'.join([evr['root_dir'], evr['table_metadata_file']])
+        if os.path.isfile(metadata_file):
+            pjl.configure_table_metadata_cache(cache_file=metadata_file)
+        try:
+            if args.apply:
+                ViewSqlUtil.apply_ddl(dbase_engine, typed_ddl)
+                logger.info('core schema rebuilt, run access_dql.sql again to recreate the public views')
+            if args.apply_generated:
+                ViewSqlUtil.apply_generated_views(dbase_engine)
+            if args.benchmark:
+                ViewSqlUtil.benchmark_unpivot(dbase_engine, repeats=args.repeats)
+            if args.check_generated:
+                ViewSqlUtil.check_generated_views(dbase_engine, repeats=args.repeats)
+        finally:
+            pjl.disable_table_metadata_cache()
+            pjl.dispose_shared_engines()